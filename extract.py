@@ -4,13 +4,63 @@
 从指定 request.log 提取 step = N 的所有条目
 使用方式:
     python extract.py logs/c4_2/request.log 10
+    python extract.py logs/c4_2/request.log 10 --pretty   # 输出缩进的 JSON 数组
 """
 
 import argparse
 import json
+import mmap
+import multiprocessing
+import os
+import re
+import sys
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
+
+# 两种实现解析失败时都抛出标准库的 JSONDecodeError
+JSONDecodeError = json.JSONDecodeError
+
+
+def _json_dumps(obj, pretty: bool = False) -> bytes:
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+if orjson is not None:
+
+    def loads(data: bytes):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson 不接受 json.dumps 默认写出的 NaN/Infinity，也不支持超过 64 位的整数，
+            # 这些行交给标准库 json 解析
+            return json.loads(data)
+
+    def dumps(obj, pretty: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option)
+        except orjson.JSONEncodeError:
+            # 由标准库解析出的超过 64 位的整数，orjson 无法序列化
+            return _json_dumps(obj, pretty)
+
+else:
+
+    def loads(data: bytes):
+        return json.loads(data)
+
+    def dumps(obj, pretty: bool = False) -> bytes:
+        return _json_dumps(obj, pretty)
+
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(
@@ -19,61 +69,206 @@ def parse_args() -> argparse.Namespace:
     # 位置参数：log_file, step
     p.add_argument("log_file", help="日志文件路径，如 logs/c4_2/request.log")
     p.add_argument("step", type=int, help="要提取的 step 值")
+    p.add_argument(
+        "-q", "--quiet", action="store_true", help="不在终端打印每个条目，只保存文件"
+    )
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="并行扫描的进程数，默认为 CPU 核数",
+    )
+    p.add_argument(
+        "--pretty",
+        action="store_true",
+        help="输出缩进的 JSON 数组（默认输出每行一个条目的 NDJSON）",
+    )
+    p.add_argument(
+        "--drop",
+        nargs="*",
+        metavar="KEY",
+        help="要从条目中剔除的字段，默认为 image_list；不带参数表示保留全部字段",
+    )
     return p.parse_args()
 
 
-def extract_step(log_path: Path, step_val: int):
-    """提取指定 step，并去掉 image_list 字段"""
+def step_pattern(step_val: int) -> "re.Pattern[bytes]":
+    """编译 step 字段的正则，数值之后不能再跟数字，避免 step=10 误命中 step=100
+
+    允许 3.0 这样的零小数写法，是否相等最终由解析后的比较决定。
+    """
+    return re.compile(
+        rb'"step"\s*:\s*' + str(step_val).encode() + rb"(?:\.0+)?(?![0-9.eE])"
+    )
+
+
+# 默认从条目中剔除的字段
+DROP_KEYS = frozenset({"image_list"})
+
+# 每个并行任务负责的字节数，实际边界会对齐到下一个换行符
+CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def _open_mmap(fp) -> mmap.mmap:
+    mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        # 提示内核顺序预读（仅 Linux/macOS 提供）
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    return mm
+
+
+def split_ranges(mm: mmap.mmap, chunk_size: int = CHUNK_SIZE) -> list:
+    """把映射内容切成约 chunk_size 大小、且以换行符结尾的 (start, end) 区间"""
+    size = len(mm)
+    ranges = []
+    start = 0
+    while start < size:
+        nl = mm.find(b"\n", start + chunk_size)
+        end = size if nl == -1 else nl + 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def extract_step(
+    log_path: Path, step_val: int, jobs: int = 1, drop_keys: frozenset = DROP_KEYS
+):
+    """逐条产出指定 step 的 (行号, 条目)，并去掉 drop_keys 中的字段
+
+    jobs > 1 且日志大于一个分块时，用多进程并行扫描各分块，结果按行号顺序产出。
+    """
     if not log_path.exists():
         raise FileNotFoundError(f"文件不存在: {log_path}")
+    if log_path.stat().st_size == 0:
+        return
+
+    with log_path.open("rb") as fp:
+        mm = _open_mmap(fp)
+        try:
+            ranges = split_ranges(mm)
+            if jobs <= 1 or len(ranges) <= 1:
+                pattern = step_pattern(step_val)
+                yield from _scan_mmap(mm, 0, len(mm), step_val, pattern, drop_keys)
+                return
+        finally:
+            mm.close()
+
+    tasks = [
+        (str(log_path), start, end, step_val, drop_keys) for start, end in ranges
+    ]
+    base = 0
+    with multiprocessing.Pool(min(jobs, len(tasks))) as pool:
+        # imap 保持任务顺序，行号只需加上前面分块的累计行数
+        for n_lines, matches in pool.imap(_scan_range, tasks):
+            for ln, obj in matches:
+                yield base + ln, obj
+            base += n_lines
+
+
+def _scan_range(task: tuple) -> tuple:
+    """子进程入口：扫描一个字节区间，返回 (区间行数, 匹配列表)"""
+    path, start, end, step_val, drop_keys = task
+    pattern = step_pattern(step_val)
+    with open(path, "rb") as fp:
+        mm = _open_mmap(fp)
+        try:
+            matches = list(_scan_mmap(mm, start, end, step_val, pattern, drop_keys))
+            n_lines = mm[start:end].count(b"\n")
+        finally:
+            mm.close()
+    return n_lines, matches
+
 
-    matches = []
-    with log_path.open(encoding="utf-8") as fp:
-        for ln, line in enumerate(fp, 1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                continue
+def _scan_mmap(
+    mm: mmap.mmap,
+    start: int,
+    stop: int,
+    step_val: int,
+    pattern: "re.Pattern[bytes]",
+    drop_keys: frozenset = DROP_KEYS,
+):
+    """在 [start, stop) 区间内产出匹配的 (区间内行号, 条目)
 
-            if obj.get("step") == step_val:
-                cleaned = obj.copy()
-                cleaned.pop("image_list", None)
-                matches.append({"line_number": ln, "data": cleaned})
-    return matches
+    直接用正则在整段缓冲区上查找目标 step，只有命中的行才回溯出行边界并解析，
+    其余行完全不经过 Python 层的逐行循环。
+    """
+    pos = start  # 始终指向某一行的行首
+    ln = 0  # pos 之前已经走过的行数
+    while pos < stop:
+        m = pattern.search(mm, pos, stop)
+        if m is None:
+            return
+        nl = mm.rfind(b"\n", pos, m.start())
+        line_start = pos if nl == -1 else nl + 1
+        line_end = mm.find(b"\n", m.end(), stop)
+        if line_end == -1:
+            line_end = stop
+
+        ln += mm[pos:line_start].count(b"\n") + 1
+        line = mm[line_start:line_end]
+        pos = line_end + 1
+
+        try:
+            obj = loads(line)
+        except JSONDecodeError:
+            continue
+
+        if obj.get("step") == step_val:
+            # obj 是本行独占的解析结果，直接原地删除即可，无需复制；
+            # 待删字段通常远少于条目字段，逐个 pop 比重建字典更省
+            for key in drop_keys:
+                obj.pop(key, None)
+            yield ln, obj
 
 
 def main():
     args = parse_args()
     log_path = Path(args.log_file)
     step_val = args.step
+    drop_keys = DROP_KEYS if args.drop is None else frozenset(args.drop)
+
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    ext = "json" if args.pretty else "ndjson"
+    out_file = f"step{step_val}_extracted_{ts}.{ext}"
 
     print(f"📖 正在读取 {log_path} ，提取 step={step_val} ...")
+    count = 0
+    out_fp = None
     try:
-        items = extract_step(log_path, step_val)
+        # 边提取边写出，内存中始终只保留一个条目
+        for ln, data in extract_step(log_path, step_val, args.jobs, drop_keys):
+            count += 1
+            if out_fp is None:
+                out_fp = open(out_file, "wb")
+                if args.pretty:
+                    out_fp.write(b"[\n")
+                if not args.quiet:
+                    print("\n" + "=" * 48)
+            elif args.pretty:
+                out_fp.write(b",\n")
+            # 每个条目只序列化一次，终端与文件共用同一份字节
+            buf = dumps(data, pretty=args.pretty)
+            out_fp.write(buf)
+            if not args.pretty:
+                out_fp.write(b"\n")
+
+            if not args.quiet:
+                print(f"\n--- 条目 {count} (行号 {ln}) ---", flush=True)
+                sys.stdout.buffer.write(buf + b"\n")
+                sys.stdout.buffer.flush()
     except Exception as exc:
         print(f"❌ 发生错误: {exc}")
         return
+    finally:
+        if out_fp is not None:
+            if args.pretty:
+                out_fp.write(b"\n]")
+            out_fp.close()
 
-    print(f"🎯 共找到 {len(items)} 个条目")
-    if not items:
-        return
-
-    # 打印
-    print("\n" + "=" * 48)
-    for idx, entry in enumerate(items, 1):
-        print(f"\n--- 条目 {idx} (行号 {entry['line_number']}) ---")
-        print(json.dumps(entry["data"], ensure_ascii=False, indent=2))
-
-    # 保存
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    out_file = f"step{step_val}_extracted_{ts}.json"
-    with open(out_file, "w", encoding="utf-8") as fp:
-        json.dump([e["data"] for e in items], fp, ensure_ascii=False, indent=2)
-
-    print(f"\n💾 结果已保存到: {out_file}")
+    print(f"🎯 共找到 {count} 个条目")
+    if count:
+        print(f"\n💾 结果已保存到: {out_file}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+import os
+import sys
+
+import pytest
+
+# 将仓库根目录加入 sys.path，便于直接运行
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("win32com.client")
+
+from ufo.automator.app_apis.excel.excelclient import ExcelWinCOMReceiver
+
+
+class _FakeUsedRange:
+    def __init__(self, address):
+        self.Address = address
+
+
+class _FakeCount:
+    def __init__(self, count):
+        self.Count = count
+
+
+class _FakeSheet:
+    """只提供 _used_range_bounds 用到的属性"""
+
+    def __init__(self, address, rows=1048576, columns=16384):
+        self.UsedRange = _FakeUsedRange(address)
+        self.Rows = _FakeCount(rows)
+        self.Columns = _FakeCount(columns)
+
+
+def test_rows2markdown_basic():
+    md = ExcelWinCOMReceiver.rows2markdown(("Name", "Qty"), (("apple", 3.0),))
+    assert md.splitlines() == [
+        "| Name  | Qty |",
+        "|-------|-----|",
+        "| apple | 3   |",
+    ]
+
+
+def test_rows2markdown_drops_all_none_rows():
+    md = ExcelWinCOMReceiver.rows2markdown(
+        ("A", "B"), ((None, None), (1, None), (None, None))
+    )
+    assert md.splitlines() == [
+        "| A | B |",
+        "|---|---|",
+        "| 1 |   |",
+    ]
+
+
+def test_rows2markdown_ragged_rows():
+    md = ExcelWinCOMReceiver.rows2markdown(("A",), ((1, "longer"), (2,)))
+    assert md.splitlines() == [
+        "| A |        |",
+        "|---|--------|",
+        "| 1 | longer |",
+        "| 2 |        |",
+    ]
+
+
+@pytest.mark.parametrize(
+    "address, expected",
+    [
+        ("$A$1", (1, 1, 1, 1)),
+        ("$B$2:$D$9", (2, 2, 9, 4)),
+        ("$AA$10:$AB$12", (10, 27, 12, 28)),
+        ("$A:$C", (None, 1, None, 3)),
+        ("$1:$5", (1, None, 5, None)),
+    ],
+)
+def test_parse_range_address(address, expected):
+    assert ExcelWinCOMReceiver._parse_range_address(address) == expected
+
+
+@pytest.mark.parametrize(
+    "address, expected",
+    [
+        ("$A$1", (1, 1, 1, 1)),
+        ("$B$2:$D$9", (2, 2, 9, 4)),
+        ("$A:$C", (1, 1, 1048576, 3)),
+        ("$1:$5", (1, 1, 5, 16384)),
+    ],
+)
+def test_used_range_bounds(address, expected):
+    assert ExcelWinCOMReceiver._used_range_bounds(_FakeSheet(address)) == expected
@@ -0,0 +1,58 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+# 将仓库根目录加入 sys.path，便于直接运行
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import extract
+
+
+def _write_log(path: Path, min_size: int) -> list:
+    """写出大于 min_size 字节的日志，返回逐行暴力解析得到的 step=10 期望结果"""
+    padding = "x" * 400
+    expected = []
+    size = 0
+    ln = 0
+    with path.open("w", encoding="utf-8") as fp:
+        while size <= min_size:
+            ln += 1
+            if ln % 997 == 0:
+                line = '{"step": 10, "broken'
+            else:
+                # 混入 step=100 检查数值边界，image_list 应被剔除
+                step = (10, 100, 3)[ln % 3]
+                obj = {"step": step, "id": ln, "image_list": [1], "pad": padding}
+                line = json.dumps(obj)
+                if step == 10:
+                    expected.append((ln, {"step": 10, "id": ln, "pad": padding}))
+            fp.write(line + "\n")
+            size += len(line) + 1
+    return expected
+
+
+def test_extract_step_jobs_match_serial(tmp_path):
+    log_path = tmp_path / "request.log"
+    expected = _write_log(log_path, extract.CHUNK_SIZE + extract.CHUNK_SIZE // 2)
+
+    serial = list(extract.extract_step(log_path, 10, jobs=1))
+    parallel = list(extract.extract_step(log_path, 10, jobs=4))
+
+    assert serial == expected
+    assert parallel == expected
+
+
+def test_extract_step_matches_float_step(tmp_path):
+    log_path = tmp_path / "request.log"
+    log_path.write_text(
+        '{"step": 3.0, "id": 1}\n{"step": 30, "id": 2}\n{"step": 3.5, "id": 3}\n'
+        '{"step": 3, "id": 4}\n',
+        encoding="utf-8",
+    )
+
+    ids = [obj["id"] for _, obj in extract.extract_step(log_path, 3)]
+
+    assert ids == [1, 4]
@@ -1,7 +1,7 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
-
+import logging
 from abc import abstractmethod
 from typing import Dict, List, Type
 
@@ -9,14 +9,22 @@ import win32com.client
 
 from ufo.automator.basic import CommandBasic, ReceiverBasic
 
+logger = logging.getLogger(__name__)
+
 
 class WinCOMReceiverBasic(ReceiverBasic):
     """
     The base class for Windows COM client.
     """
 
+    # Subclasses without their own __slots__ still get an instance __dict__.
+    __slots__ = ("app_root_name", "process_name", "clsid", "client", "com_object")
+
     _command_registry: Dict[str, Type[CommandBasic]] = {}
 
+    # Whether to bind the COM client through the makepy-generated wrappers (early binding).
+    _early_binding: bool = False
+
     def __init__(self, app_root_name: str, process_name: str, clsid: str) -> None:
         """
         Initialize the Windows COM client.
@@ -34,7 +42,7 @@ class WinCOMReceiverBasic(ReceiverBasic):
         print(f"DEBUG: clsid = {self.clsid}")
 
         try:
-            self.client = win32com.client.Dispatch(self.clsid)
+            self.client = self.create_client()
             print(f"DEBUG: COM client created successfully")
         except Exception as e:
             print(f"DEBUG: Failed to create COM client: {e}")
@@ -68,6 +76,29 @@ class WinCOMReceiverBasic(ReceiverBasic):
         print(f"DEBUG: com_object type = {type(self.com_object)}")
         print(f"DEBUG: === End COM State Debug ===")
         
+    def create_client(self) -> win32com.client.CDispatch:
+        """
+        Create the COM client. With early binding, calls go through pre-resolved DISPIDs
+        instead of resolving each member name through IDispatch at call time.
+        Unlike late binding, member names must match the type library case exactly, and the
+        makepy wrappers are written to the gen_py cache on first use. Property writes are still
+        passed as plain IDispatch invokes, and the receivers pass numeric format codes rather than
+        win32com.client.constants, so both binding modes accept the same calls.
+        Falls back to late binding if the type library wrappers cannot be generated.
+        :return: The COM client.
+        """
+        if self._early_binding:
+            try:
+                return win32com.client.gencache.EnsureDispatch(self.clsid)
+            except Exception as e:
+                logger.warning(
+                    "Early binding failed for %s, falling back to Dispatch: %s",
+                    self.clsid,
+                    e,
+                )
+
+        return win32com.client.Dispatch(self.clsid)
+
     @abstractmethod
     def get_object_from_process_name(self) -> win32com.client.CDispatch:
         """
@@ -192,6 +223,8 @@ class WinCOMCommand(CommandBasic):
     The abstract command interface.
     """
 
+    __slots__ = ()
+
     def __init__(self, receiver: WinCOMReceiverBasic, params=None) -> None:
         """
         Initialize the command.
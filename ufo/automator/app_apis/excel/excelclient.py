@@ -1,17 +1,45 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
+import csv
+import logging
 import os
-from typing import Any, Dict, List, Type, Union
-import os
+import re
 import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Type, Union
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from ufo.automator.app_apis.basic import WinCOMCommand, WinCOMReceiverBasic
 from ufo.automator.basic import CommandBasic
 
+logger = logging.getLogger(__name__)
+
+_EXCEL_EXT_TO_FILEFORMAT: Dict[str, int] = {
+    ".xlsx": 51,  # Excel Workbook (default, no macros)
+    ".xlsm": 52,  # Excel Macro-Enabled Workbook
+    ".xlsb": 50,  # Excel Binary Workbook
+    ".xls": 56,  # Excel 97-2003 Workbook
+    ".xltx": 54,  # Excel Template
+    ".xltm": 53,  # Excel Macro-Enabled Template
+    ".csv": 6,  # CSV (comma delimited)
+    ".txt": 42,  # Text (tab delimited)
+    ".pdf": 57,  # PDF file (Excel 2007+)
+    ".xps": 58,  # XPS file
+    ".xml": 46,  # XML Spreadsheet 2003
+    ".html": 44,  # HTML file
+    ".htm": 44,  # HTML file
+    ".prn": 36,  # Formatted text (space delimited)
+}
+
+_XL_CALCULATION_MANUAL = -4135
+
+_CELL_ADDRESS_PATTERN = re.compile(r"^\$?([A-Z]*)\$?(\d*)$")
+
 
 class ExcelWinCOMReceiver(WinCOMReceiverBasic):
     """
@@ -20,89 +48,68 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
 
     _command_registry: Dict[str, Type[CommandBasic]] = {}
 
+    _early_binding = True
+
     def get_object_from_process_name(self) -> None:
         """
         Get the object from the process name.
         :return: The matched object.
         """
         try:
-            print(f"DEBUG: Starting get_object_from_process_name")
-            print(f"DEBUG: self.client = {self.client}")
-            
             if not self.client:
-                print("DEBUG: Client is None, returning None")
+                logger.debug("Excel client is None, returning None")
                 return None
-            
-            # 获取所有工作簿
+
             workbooks = self.client.Workbooks
-            print(f"DEBUG: Workbooks collection = {workbooks}")
-            print(f"DEBUG: Workbooks count = {workbooks.Count}")
-            
-            object_name_list = []
-            for i in range(1, workbooks.Count + 1):
-                try:
-                    workbook = workbooks.Item(i)
-                    name = workbook.Name
-                    object_name_list.append(name)
-                    print(f"DEBUG: Workbook {i}: {name}")
-                    print(f"DEBUG: Workbook {i} encoding: {name.encode('utf-8')}")
-                except Exception as e:
-                    print(f"DEBUG: Error getting workbook {i}: {e}")
-            
-            print(f"DEBUG: object_name_list = {object_name_list}")
-            print(f"DEBUG: process_name = {self.process_name}")
-            print(f"DEBUG: process_name encoding: {self.process_name.encode('utf-8')}")
-            
-            if not object_name_list:
-                print("DEBUG: No workbooks found")
+
+            # 精确匹配时直接按名称取工作簿，只需一次 COM 调用
+            try:
+                return workbooks(self.process_name)
+            except Exception:
+                pass
+
+            # 每个工作簿只取一次 Item 与 Name，避免重复的跨进程 COM 调用
+            items = [workbooks.Item(i) for i in range(1, workbooks.Count + 1)]
+            if not items:
+                logger.debug("No workbooks found")
                 return None
-            
-            # 尝试直接匹配
-            for name in object_name_list:
-                if name == self.process_name:
-                    print(f"DEBUG: Direct match found: {name}")
-                    for i in range(1, workbooks.Count + 1):
-                        workbook = workbooks.Item(i)
-                        if workbook.Name == name:
-                            return workbook
-            
+
+            names = [workbook.Name for workbook in items]
+            name_to_workbook = dict(zip(names, items))
+
             # 尝试app_match
-            matched_object = self.app_match(object_name_list)
-            print(f"DEBUG: app_match result = {matched_object}")
-            
-            if matched_object:
-                for i in range(1, workbooks.Count + 1):
-                    workbook = workbooks.Item(i)
-                    if workbook.Name == matched_object:
-                        print(f"DEBUG: Found matched workbook: {workbook.Name}")
-                        return workbook
-            
+            matched_object = self.app_match(names)
+            logger.debug("app_match result = %s", matched_object)
+            workbook = name_to_workbook.get(matched_object)
+
             # 如果都失败了，返回第一个工作簿
-            if workbooks.Count > 0:
-                first_workbook = workbooks.Item(1)
-                print(f"DEBUG: Returning first workbook: {first_workbook.Name}")
-                return first_workbook
-            
-            print("DEBUG: No workbooks available")
-            return None
-            
+            return workbook if workbook is not None else items[0]
+
         except Exception as e:
-            print(f"DEBUG: Exception in get_object_from_process_name: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.debug(
+                "Exception in get_object_from_process_name: %s", e, exc_info=True
+            )
             return None
 
-    def table2markdown(self, sheet_name: Union[str, int]) -> str:
+    def table2markdown(
+        self, sheet_name: Union[str, int], use_pandas: bool = False
+    ) -> str:
         """
         Convert the table in the sheet to a markdown table string.
         :param sheet_name: The sheet name (str), or the sheet index (int), starting from 1.
+        :param use_pandas: Whether to build the table through pandas.DataFrame.to_markdown instead of emitting it directly.
         :return: The markdown table string.
         """
 
-        sheet = self.com_object.Sheets(sheet_name)
+        sheet = self._get_sheet(sheet_name)
 
         # Fetch the data from the sheet
         data = sheet.UsedRange()
+        if not isinstance(data, tuple):
+            data = ((data,),)
+
+        if not use_pandas:
+            return self.rows2markdown(data[0], data[1:])
 
         # Convert the data to a DataFrame
         df = pd.DataFrame(data[1:], columns=data[0])
@@ -111,10 +118,53 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
         df = df.dropna(axis=0, how="all")
 
         # Convert the values to strings
-        df = df.applymap(self.format_value)
+        df = self.format_frame(df)
 
         return df.to_markdown(index=False)
 
+    @classmethod
+    def rows2markdown(cls, header: tuple, rows: tuple) -> str:
+        """
+        Emit a markdown table directly from the rows fetched from Excel, without building a DataFrame.
+        Rows whose values are all empty are dropped.
+        :param header: The header row.
+        :param rows: The data rows.
+        :return: The markdown table string.
+        """
+
+        def to_text(value: Any) -> str:
+            return "" if value is None else str(cls.format_value(value))
+
+        header_cells = [to_text(value) for value in header]
+        body = [
+            [to_text(value) for value in row]
+            for row in rows
+            if any(value is not None for value in row)
+        ]
+
+        # Pad ragged rows so every row, header included, has the same number of cells.
+        column_count = max([len(header_cells)] + [len(cells) for cells in body])
+        for cells in [header_cells] + body:
+            cells.extend([""] * (column_count - len(cells)))
+
+        widths = [len(cell) for cell in header_cells]
+        for cells in body:
+            for i, cell in enumerate(cells):
+                if len(cell) > widths[i]:
+                    widths[i] = len(cell)
+
+        def to_line(cells: List[str]) -> str:
+            return (
+                "| "
+                + " | ".join(cell.ljust(width) for cell, width in zip(cells, widths))
+                + " |"
+            )
+
+        lines = [to_line(header_cells)]
+        lines.append("|" + "|".join("-" * (width + 2) for width in widths) + "|")
+        lines.extend(to_line(cells) for cells in body)
+        return "\n".join(lines)
+
     def insert_excel_table(
         self, sheet_name: str, table: List[List[Any]], start_row: int, start_col: int
     ):
@@ -125,14 +175,35 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
         :param start_row: The start row.
         :param start_col: The start column.
         """
-        sheet = self.com_object.Sheets(sheet_name)
+        sheet = self._get_sheet(sheet_name)
 
         if str(start_col).isalpha():
             start_col = self.letters_to_number(start_col)
 
-        for i, row in enumerate(table):
-            for j, value in enumerate(row):
-                sheet.Cells(start_row + i, start_col + j).Value = value
+        if not table:
+            return table
+
+        # A table whose rows are all empty has nothing to write.
+        width = max(len(row) for row in table)
+        if width == 0:
+            return table
+
+        with self.bulk_mode():
+            # Write the whole block in a single COM call instead of one call per cell.
+            if all(len(row) == width for row in table):
+                sheet.Range(
+                    sheet.Cells(start_row, start_col),
+                    sheet.Cells(start_row + len(table) - 1, start_col + width - 1),
+                ).Value = tuple(tuple(row) for row in table)
+            else:
+                # Ragged rows are written row by row so cells beyond a short row stay untouched.
+                for i, row in enumerate(table):
+                    if not row:
+                        continue
+                    sheet.Range(
+                        sheet.Cells(start_row + i, start_col),
+                        sheet.Cells(start_row + i, start_col + len(row) - 1),
+                    ).Value = (tuple(row),)
 
         return table
 
@@ -153,12 +224,7 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
         :param end_col: The end column. If ==-1, select to the end of the document with content.
         """
 
-        sheet_list = [sheet.Name for sheet in self.com_object.Sheets]
-        if sheet_name not in sheet_list:
-            print(
-                f"Sheet {sheet_name} not found in the workbook, using the first sheet."
-            )
-            sheet_name = 1
+        sheet = self._get_sheet(sheet_name)
 
         if str(start_col).isalpha():
             start_col = self.letters_to_number(start_col)
@@ -166,12 +232,7 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
         if str(end_col).isalpha():
             end_col = self.letters_to_number(end_col)
 
-        sheet = self.com_object.Sheets(sheet_name)
-
-        if end_row == -1:
-            end_row = sheet.Rows.Count
-        if end_col == -1:
-            end_col = sheet.Columns.Count
+        end_row, end_col = self._resolve_range_bounds(sheet, end_row, end_col)
 
         try:
             sheet.Range(
@@ -190,17 +251,18 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
         :return: Success or error message
         """
         try:
-            ws = self.com_object.Sheets(sheet_name)
-            used_range = ws.UsedRange
-            start_col = used_range.Column
-            total_cols = used_range.Columns.Count
-            last_col = start_col + total_cols - 1
+            ws = self._get_sheet(sheet_name)
+            _, _, last_row, last_col = self._used_range_bounds(ws)
+
+            # Read the sheet from A1 to the end of the used range in a single COM call.
+            all_values = ws.Range(ws.Cells(1, 1), ws.Cells(last_row, last_col)).Value
+            if not isinstance(all_values, tuple):
+                all_values = ((all_values,),)
 
             non_empty_columns = []
             empty_columns = []
 
-            for col in range(1, last_col + 1):
-                cell_value = ws.Cells(1, col).Value
+            for col, cell_value in enumerate(all_values[0], start=1):
                 if cell_value and str(cell_value).strip():
                     non_empty_columns.append((str(cell_value).strip(), col))
                 else:
@@ -212,31 +274,29 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
             name_to_col = {name: col for name, col in non_empty_columns}
 
             column_data = []
-            for name in desired_order:
+            # Each name is placed once, so there are never more columns than non-empty positions
+            for name in dict.fromkeys(desired_order):
                 if name in name_to_col:
-                    col_index = name_to_col[name]
-                    data = []
-                    row = 1
-                    while True:
-                        value = ws.Cells(row, col_index).Value
-                        if value is None and row > 100:
-                            break
-                        data.append(value)
-                        row += 1
-                    column_data.append((name, data))
+                    col_index = name_to_col[name] - 1
+                    column_data.append((name, [row[col_index] for row in all_values]))
                 else:
                     print(f"⚠️ Column '{name}' not found, skipping.")
 
-            for _, col_index in sorted(non_empty_columns, key=lambda x: -x[1]):
-                ws.Columns(col_index).Delete()
+            # The Nth insert position is the Nth column that was not empty, computed once.
+            empty_set = set(empty_columns)
+            non_empty_positions = [
+                col for col in range(1, last_col + 1) if col not in empty_set
+            ]
+
+            with self.bulk_mode():
+                self._delete_columns(ws, [col for _, col in non_empty_columns])
 
-            insert_offset = 1
-            for name, data in column_data:
-                insert_pos = self.get_nth_non_empty_position(insert_offset, empty_columns)
-                print(f"✅ Inserting '{name}' at position {insert_pos}")
-                for row_index, value in enumerate(data, start=1):
-                    ws.Cells(row_index, insert_pos).Value = value
-                insert_offset += 1
+                for insert_offset, (name, data) in enumerate(column_data):
+                    insert_pos = non_empty_positions[insert_offset]
+                    print(f"✅ Inserting '{name}' at position {insert_pos}")
+                    ws.Range(
+                        ws.Cells(1, insert_pos), ws.Cells(len(data), insert_pos)
+                    ).Value = tuple((value,) for value in data)
 
             return f"Columns reordered successfully into: {desired_order}"
 
@@ -251,6 +311,7 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
         start_col: int,
         end_row: int = -1,
         end_col: int = -1,
+        as_ndarray: bool = False,
     ):
         """
         Get values from Excel sheet starting at (start_row, start_col) to (end_row, end_col).
@@ -261,26 +322,13 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
         :param start_col: Starting column index (1-based)
         :param end_row: Ending row index, -1 means go to the last used row
         :param end_col: Ending column index, -1 means go to the last used column
-        :return: List of lists (2D) containing the values
+        :param as_ndarray: Return a 2D numpy object array built in one allocation instead of a list of lists
+        :return: List of lists (2D) containing the values, or a 2D numpy array if as_ndarray is True
         """
 
-        sheet_list = [sheet.Name for sheet in self.com_object.Sheets]
-        if sheet_name not in sheet_list:
-            print(
-                f"Sheet {sheet_name} not found in the workbook, using the first sheet."
-            )
-            sheet_name = 1
-
-        sheet = self.com_object.Sheets(sheet_name)
+        sheet = self._get_sheet(sheet_name)
 
-        used_range = sheet.UsedRange
-        last_row = used_range.Row + used_range.Rows.Count - 1
-        last_col = used_range.Column + used_range.Columns.Count - 1
-
-        if end_row == -1:
-            end_row = last_row
-        if end_col == -1:
-            end_col = last_col
+        end_row, end_col = self._resolve_range_bounds(sheet, end_row, end_col)
 
         cell_range = sheet.Range(
             sheet.Cells(start_row, start_col), sheet.Cells(end_row, end_col)
@@ -294,14 +342,122 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
 
         # If it's a single cell, return [[value]]
         if not isinstance(values, tuple):
-            return [[values]]
+            values = ((values,),)
 
-        # If it's a single row or column, make sure it’s 2D list
-        if isinstance(values[0], (str, int, float, type(None))):
-            return [list(values)]
+        # If it's a single row or column, make sure it’s 2D
+        elif isinstance(values[0], (str, int, float, type(None))):
+            values = (values,)
+
+        if as_ndarray:
+            return np.asarray(values, dtype=object)
 
         return [list(row) for row in values]
 
+    def _get_sheet(self, sheet_name: Union[str, int]):
+        """
+        Resolve the sheet with a single Sheets() lookup, falling back to the first sheet.
+        :param sheet_name: The sheet name (str), or the sheet index (int), starting from 1.
+        :return: The sheet COM object.
+        """
+        try:
+            return self.com_object.Sheets(sheet_name)
+        except Exception:
+            print(
+                f"Sheet {sheet_name} not found in the workbook, using the first sheet."
+            )
+            return self.com_object.Sheets(1)
+
+    @contextmanager
+    def bulk_mode(self):
+        """
+        Suspend screen updating, automatic calculation and events while the
+        wrapped block mutates the workbook, and restore them afterwards.
+        """
+        app = self.client
+        try:
+            saved = (app.ScreenUpdating, app.Calculation, app.EnableEvents)
+        except Exception as e:
+            logger.debug("Failed to read application state: %s", e)
+            saved = None
+
+        if saved is not None:
+            try:
+                app.ScreenUpdating = False
+                app.Calculation = _XL_CALCULATION_MANUAL
+                app.EnableEvents = False
+            except Exception as e:
+                logger.debug("Failed to enter bulk mode: %s", e)
+
+        try:
+            yield
+        finally:
+            if saved is not None:
+                try:
+                    app.ScreenUpdating, app.Calculation, app.EnableEvents = saved
+                except Exception as e:
+                    logger.debug("Failed to restore application state: %s", e)
+
+    @classmethod
+    def _parse_range_address(cls, address: str) -> tuple:
+        """
+        Parse an A1-style range address into its corner bounds.
+        Whole-column ("$A:$C") and whole-row ("$1:$5") ranges leave the missing bounds as None.
+        :param address: The range address, e.g. "$A$1", "$B$2:$D$9", "$A:$C" or "$1:$5".
+        :return: The (first_row, first_col, last_row, last_col), each an int or None.
+        """
+        corners = []
+        for part in address.split(":"):
+            match = _CELL_ADDRESS_PATTERN.match(part.strip())
+            if match is None:
+                raise ValueError(f"Invalid range address: {address}")
+            letters, digits = match.groups()
+            corners.append(
+                (
+                    int(digits) if digits else None,
+                    cls.letters_to_number(letters) if letters else None,
+                )
+            )
+        (first_row, first_col), (last_row, last_col) = corners[0], corners[-1]
+        return first_row, first_col, last_row, last_col
+
+    @classmethod
+    def _used_range_bounds(cls, sheet) -> tuple:
+        """
+        Get the bounds of the used range of the sheet from a single Address read,
+        instead of fetching Row, Column, Rows.Count and Columns.Count separately.
+        :param sheet: The sheet COM object.
+        :return: The (first_row, first_col, last_row, last_col) of the used range.
+        """
+        first_row, first_col, last_row, last_col = cls._parse_range_address(
+            sheet.UsedRange.Address
+        )
+        # Whole-column or whole-row ranges span the sheet in the missing dimension.
+        if first_row is None:
+            first_row, last_row = 1, sheet.Rows.Count
+        if first_col is None:
+            first_col, last_col = 1, sheet.Columns.Count
+        return first_row, first_col, last_row, last_col
+
+    @classmethod
+    def _resolve_range_bounds(cls, sheet, end_row: int, end_col: int) -> tuple:
+        """
+        Replace the -1 end bounds with the last used row or column of the sheet.
+        The UsedRange is only read when needed, and bounds never extend to the full sheet size.
+        :param sheet: The sheet COM object.
+        :param end_row: The end row, -1 means the last used row.
+        :param end_col: The end column, -1 means the last used column.
+        :return: The resolved (end_row, end_col).
+        """
+        if end_row != -1 and end_col != -1:
+            return end_row, end_col
+
+        _, _, last_row, last_col = cls._used_range_bounds(sheet)
+        if end_row == -1:
+            end_row = last_row
+        if end_col == -1:
+            end_col = last_col
+        return end_row, end_col
+
     def save_as(
         self, file_dir: str = "", file_name: str = "", file_ext: str = ""
     ) -> str:
@@ -313,23 +469,6 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
         :return: Success message or error details.
         """
 
-        excel_ext_to_fileformat = {
-            ".xlsx": 51,  # Excel Workbook (default, no macros)
-            ".xlsm": 52,  # Excel Macro-Enabled Workbook
-            ".xlsb": 50,  # Excel Binary Workbook
-            ".xls": 56,  # Excel 97-2003 Workbook
-            ".xltx": 54,  # Excel Template
-            ".xltm": 53,  # Excel Macro-Enabled Template
-            ".csv": 6,  # CSV (comma delimited)
-            ".txt": 42,  # Text (tab delimited)
-            ".pdf": 57,  # PDF file (Excel 2007+)
-            ".xps": 58,  # XPS file
-            ".xml": 46,  # XML Spreadsheet 2003
-            ".html": 44,  # HTML file
-            ".htm": 44,  # HTML file
-            ".prn": 36,  # Formatted text (space delimited)
-        }
-
         # Enhanced path handling
         if not file_dir:
             file_dir = os.path.dirname(self.com_object.FullName)
@@ -357,18 +496,22 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
                 # Final fallback to temp directory
                 file_dir = tempfile.gettempdir()
 
-        # Generate unique filename if file exists
-        base_file_path = os.path.join(file_dir, file_name + file_ext)
-        file_path = base_file_path
+        # Generate unique filename if file exists, listing the directory only once
+        try:
+            # Windows file names are case-insensitive
+            existing = {name.lower() for name in os.listdir(file_dir)}
+        except OSError:
+            existing = set()
+
+        candidate = file_name + file_ext
         counter = 1
-        
-        while os.path.exists(file_path):
-            name_with_counter = f"{file_name}_{counter}"
-            file_path = os.path.join(file_dir, name_with_counter + file_ext)
+        while candidate.lower() in existing:
+            candidate = f"{file_name}_{counter}{file_ext}"
             counter += 1
+        file_path = os.path.join(file_dir, candidate)
 
         # Get file format
-        file_format = excel_ext_to_fileformat.get(file_ext.lower(), 51)  # Default to xlsx
+        file_format = _EXCEL_EXT_TO_FILEFORMAT.get(file_ext.lower(), 51)  # Default to xlsx
 
         try:
             # Attempt to save with different methods
@@ -403,7 +546,7 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
                             Type=export_format,
                             Filename=file_path,
                             Quality=0,  # 0=minimum, 1=maximum
-                            IncludeDocProps=True,
+                            IncludeDocProperties=True,
                             IgnorePrintAreas=False,
                             OpenAfterPublish=False
                         )
@@ -419,26 +562,22 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
                         used_range = active_sheet.UsedRange
                         
                         if used_range:
-                            # Save as CSV using pandas fallback
-                            import pandas as pd
-                            
                             # Get data from Excel
                             data = used_range.Value
                             if data:
-                                if isinstance(data[0], (list, tuple)):
-                                    df = pd.DataFrame(data[1:], columns=data[0])
-                                else:
-                                    df = pd.DataFrame([data])
-                                
-                                # Save using pandas
-                                if file_ext.lower() == '.csv':
-                                    df.to_csv(file_path, index=False)
-                                else:
-                                    df.to_csv(file_path, sep='\t', index=False)
-                                    
-                                return f"Document successfully saved to {file_path} (pandas method)."
+                                if not isinstance(data, tuple):
+                                    data = ((data,),)
+                                elif not isinstance(data[0], (list, tuple)):
+                                    data = (data,)
+
+                                # Stream the rows straight to disk
+                                delimiter = "," if file_ext.lower() == ".csv" else "\t"
+                                with open(file_path, "w", newline="", encoding="utf-8") as f:
+                                    csv.writer(f, delimiter=delimiter).writerows(data)
+
+                                return f"Document successfully saved to {file_path} (csv method)."
                     except Exception as e4:
-                        print(f"Pandas fallback failed: {e4}")
+                        print(f"CSV fallback failed: {e4}")
                 
                 # Final fallback: save as default Excel format in Documents
                 try:
@@ -475,6 +614,44 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
             return tempfile.gettempdir()
 
 
+    @classmethod
+    def _delete_columns(cls, sheet, columns: List[int]) -> None:
+        """
+        Delete the columns with multi-area range deletes instead of one Delete() per column.
+        Range addresses are limited to 255 characters, so the columns are deleted in groups,
+        starting from the rightmost group so the remaining indexes stay valid.
+        :param sheet: The sheet COM object.
+        :param columns: The column indexes to delete.
+        """
+        groups = []
+        address = ""
+        for col in sorted(set(columns)):
+            letters = cls.number_to_letters(col)
+            area = f"{letters}:{letters}"
+            if address and len(address) + len(area) + 1 > 255:
+                groups.append(address)
+                address = area
+            else:
+                address = f"{address},{area}" if address else area
+        if address:
+            groups.append(address)
+
+        for address in reversed(groups):
+            sheet.Range(address).EntireColumn.Delete()
+
+    @staticmethod
+    def number_to_letters(number: int) -> str:
+        """
+        Convert the column number to the column letters.
+        :param number: The column number, starting from 1.
+        :return: The column letters.
+        """
+        letters = ""
+        while number > 0:
+            number, remainder = divmod(number - 1, 26)
+            letters = chr(ord("A") + remainder) + letters
+        return letters
+
     @staticmethod
     def letters_to_number(letters: str) -> int:
         """
@@ -483,26 +660,31 @@ class ExcelWinCOMReceiver(WinCOMReceiverBasic):
         :return: The column number.
         """
         number = 0
-        for i, letter in enumerate(letters[::-1]):
-            number += (ord(letter.upper()) - ord("A") + 1) * (26**i)
+        for letter in letters:
+            # ord & 0x1F maps both 'A'..'Z' and 'a'..'z' to 1..26
+            number = number * 26 + (ord(letter) & 0x1F)
         return number
 
-    @staticmethod
-    def get_nth_non_empty_position(target_idx: int, empty_cols: List[int]) -> int:
-        """
-        Get the Nth available column index in the sheet, skipping empty columns.
-        :param target_idx: The target index of the non-empty column.
-        :param empty_cols: The list of empty column indexes.
-        :return: The Nth non-empty column index.
-        """
-        col = 1
-        non_empty_count = 0
-        while True:
-            if col not in empty_cols:
-                non_empty_count += 1
-            if non_empty_count == target_idx:
-                return col
-            col += 1
+    @classmethod
+    def format_frame(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert the values of the DataFrame to formatted strings column by column.
+        Numeric columns are formatted in one pass, only mixed-type columns fall back to format_value.
+        :param df: The DataFrame to be converted.
+        :return: The converted DataFrame.
+        """
+        if df.columns.empty:
+            return df
+
+        formatted = [
+            (
+                column.map("{:.0f}".format)
+                if pd.api.types.is_numeric_dtype(column)
+                else column.map(cls.format_value)
+            )
+            for _, column in df.items()
+        ]
+        return pd.concat(formatted, axis=1)
 
     @staticmethod
     def format_value(value: Any) -> str:
@@ -1,16 +1,119 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
+import functools
+import logging
 import os
-import time
+import re
+import shutil
 import tempfile
-import getpass
+import time
 from pathlib import Path
-from typing import Dict, Type, List
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Type
 
 from ufo.automator.app_apis.basic import WinCOMCommand, WinCOMReceiverBasic
 from ufo.automator.basic import CommandBasic
 
+logger = logging.getLogger(__name__)
+
+_PPT_EXT_TO_FILEFORMAT: Mapping[str, int] = MappingProxyType(
+    {
+        ".pptx": 24,  # PowerPoint Presentation (OpenXML)
+        ".ppt": 0,  # PowerPoint 97-2003 Presentation
+        ".pdf": 32,  # PDF file
+        ".xps": 33,  # XPS file
+        ".potx": 25,  # PowerPoint Template (OpenXML)
+        ".pot": 5,  # PowerPoint 97-2003 Template
+        ".ppsx": 27,  # PowerPoint Show (OpenXML)
+        ".pps": 1,  # PowerPoint 97-2003 Show
+        ".odp": 35,  # OpenDocument Presentation
+        ".jpg": 17,  # JPG images (slides exported as .jpg)
+        ".png": 18,  # PNG images
+        ".gif": 19,  # GIF images
+        ".bmp": 20,  # BMP images
+        ".tif": 21,  # TIFF images
+        ".tiff": 21,  # TIFF images
+        ".rtf": 6,  # Outline RTF
+        ".html": 12,  # Single File Web Page
+        ".mp4": 39,  # MPEG-4 video (requires PowerPoint 2013+)
+        ".wmv": 38,  # Windows Media Video
+        ".xml": 10,  # PowerPoint 2003 XML Presentation
+    }
+)
+
+_PPT_EXT_TO_FORMATSTR: Mapping[str, str] = MappingProxyType(
+    {
+        ".jpg": "JPG",  # JPG images (slides exported as .jpg)
+        ".png": "PNG",  # PNG images
+        ".gif": "GIF",  # GIF images
+        ".bmp": "BMP",  # BMP images
+        ".tif": "TIF",  # TIFF images
+        ".tiff": "TIF",  # TIFF images
+    }
+)
+
+# The %USERNAME% placeholder, matched case-insensitively like Windows environment variables.
+_USERNAME_PATTERN = re.compile(r"%USERNAME%", re.IGNORECASE)
+
+_HOME = os.path.expanduser("~")
+_DOCS = os.path.join(_HOME, "Documents")
+
+# Desktop path candidates in lookup order, built once from the environment at import.
+_DESKTOP_CANDIDATES = tuple(
+    dict.fromkeys(
+        path
+        for path in (
+            os.path.join(_HOME, "Desktop"),
+            os.environ.get("USERPROFILE")
+            and os.path.join(os.environ["USERPROFILE"], "Desktop"),
+            os.environ.get("HOMEPATH")
+            and os.path.join(
+                os.environ.get("HOMEDRIVE", ""), os.environ["HOMEPATH"], "Desktop"
+            ),
+            os.path.join(_HOME, "桌面"),  # 中文系统
+        )
+        if path
+    )
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_username() -> str:
+    """
+    Get the current user name, resolved once per process.
+    """
+    import getpass
+
+    return getpass.getuser()
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_desktop_path() -> str:
+    """
+    Resolve a writable desktop path, falling back to Documents, the home directory and the temp directory.
+    """
+    try:
+        # os.access is False for a missing path, so no separate existence check is needed
+        for path in _DESKTOP_CANDIDATES:
+            if os.access(path, os.W_OK):
+                logger.debug("Found desktop at: %s", path)
+                return path
+        
+        # Fallback to Documents
+        if os.path.exists(_DOCS):
+            logger.debug("Fallback to Documents: %s", _DOCS)
+            return _DOCS
+        
+        # Final fallback to user home
+        return _HOME
+        
+    except Exception as e:
+        logger.debug("Error getting desktop path: %s", e)
+        # Final fallback to temp directory
+
+        return tempfile.gettempdir()
+
 
 class PowerPointWinCOMReceiver(WinCOMReceiverBasic):
     """
@@ -19,81 +122,111 @@ class PowerPointWinCOMReceiver(WinCOMReceiverBasic):
 
     _command_registry: Dict[str, Type[CommandBasic]] = {}
 
+    # Early binding, see WinCOMReceiverBasic.create_client. Keyword arguments below use the
+    # PowerPoint type library parameter names, which the generated wrappers require.
+    _early_binding = True
+
+    __slots__ = ("_save_plans",)
+
+    def __init__(self, app_root_name: str, process_name: str, clsid: str) -> None:
+        """
+        Initialize the PowerPoint COM client.
+        :param app_root_name: The app root name.
+        :param process_name: The process name.
+        :param clsid: The CLSID of the COM object.
+        """
+        # The save strategies applicable to each lower-cased file extension, the last successful one first.
+        self._save_plans: Dict[str, Tuple[str, ...]] = {}
+        super().__init__(app_root_name, process_name, clsid)
+
     def get_object_from_process_name(self) -> None:
         """
         Get the object from the process name.
         :return: The matched object.
         """
         try:
-            print(f"DEBUG: Starting PowerPoint get_object_from_process_name")
+            logger.debug("Starting PowerPoint get_object_from_process_name")
             
             if not self.client:
-                print("DEBUG: PowerPoint client is None, returning None")
+                logger.debug("PowerPoint client is None, returning None")
                 return None
             
             # 获取所有演示文稿
             presentations = self.client.Presentations
-            print(f"DEBUG: Presentations collection count = {presentations.Count}")
+            count = presentations.Count
+            logger.debug("Presentations collection count = %s", count)
             
-            object_name_list = []
-            for i in range(1, presentations.Count + 1):
+            # 一次遍历同时记录名称和演示文稿对象，后续匹配直接复用，无需再次取 Item
+            name_to_presentation: Dict[str, object] = {}
+            for i in range(1, count + 1):
                 try:
                     presentation = presentations.Item(i)
                     name = presentation.Name
-                    object_name_list.append(name)
-                    print(f"DEBUG: Presentation {i}: {name}")
-                    print(f"DEBUG: Presentation {i} encoding: {name.encode('utf-8')}")
+                    name_to_presentation.setdefault(name, presentation)
+                    logger.debug("Presentation %s: %s", i, name)
                 except Exception as e:
-                    print(f"DEBUG: Error getting presentation {i}: {e}")
+                    logger.debug("Error getting presentation %s: %s", i, e)
             
-            print(f"DEBUG: object_name_list = {object_name_list}")
-            print(f"DEBUG: process_name = {self.process_name}")
-            print(f"DEBUG: process_name encoding: {self.process_name.encode('utf-8')}")
+            object_name_list = list(name_to_presentation)
+            logger.debug("object_name_list = %s", object_name_list)
+            logger.debug("process_name = %s", self.process_name)
             
             # 如果没有打开的演示文稿，创建一个新演示文稿
-            if presentations.Count == 0:
-                print("DEBUG: No presentations open, creating a new presentation")
+            if count == 0:
+                logger.debug("No presentations open, creating a new presentation")
                 try:
-                    new_presentation = self.client.Presentations.Add()
-                    print(f"DEBUG: New presentation created: {new_presentation.Name}")
+                    new_presentation = presentations.Add()
+                    logger.debug("New presentation created")
                     return new_presentation
                 except Exception as e:
-                    print(f"DEBUG: Failed to create new presentation: {e}")
+                    logger.debug("Failed to create new presentation: %s", e)
                     return None
             
             # 如果有演示文稿，尝试匹配
             matched_object = self.app_match(object_name_list)
-            print(f"DEBUG: app_match result = {matched_object}")
+            logger.debug("app_match result = %s", matched_object)
             
             # 如果process_name只是"PowerPoint"或匹配失败，返回第一个演示文稿
             if (self.process_name.lower() in ["powerpoint", "pptx", "microsoft powerpoint"] or 
                 not matched_object):
-                if presentations.Count > 0:
-                    first_presentation = presentations.Item(1)
-                    print(f"DEBUG: Returning first presentation: {first_presentation.Name}")
-                    return first_presentation
+                if count > 0:
+                    logger.debug("Returning first presentation")
+                    return self._first_presentation(presentations, name_to_presentation)
             
             # 尝试找到匹配的演示文稿
-            for presentation in presentations:
-                if presentation.Name == matched_object:
-                    print(f"DEBUG: Found matched presentation: {presentation.Name}")
-                    return presentation
+            matched_presentation = name_to_presentation.get(matched_object)
+            if matched_presentation is not None:
+                logger.debug("Found matched presentation: %s", matched_object)
+                return matched_presentation
             
             # 如果都失败了，返回第一个演示文稿
-            if presentations.Count > 0:
-                first_presentation = presentations.Item(1)
-                print(f"DEBUG: Fallback: returning first presentation: {first_presentation.Name}")
-                return first_presentation
+            if count > 0:
+                logger.debug("Fallback: returning first presentation")
+                return self._first_presentation(presentations, name_to_presentation)
             
-            print("DEBUG: No presentations available and failed to create new one")
+            logger.debug("No presentations available and failed to create new one")
             return None
             
         except Exception as e:
-            print(f"DEBUG: Exception in PowerPoint get_object_from_process_name: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.debug(
+                "Exception in PowerPoint get_object_from_process_name: %s",
+                e,
+                exc_info=True,
+            )
             return None
 
+    @staticmethod
+    def _first_presentation(presentations, name_to_presentation: Dict[str, object]):
+        """
+        Get the first presentation, reusing the proxy fetched while listing the names.
+        :param presentations: The presentations collection.
+        :param name_to_presentation: The presentations fetched so far, in collection order.
+        :return: The first presentation.
+        """
+        for presentation in name_to_presentation.values():
+            return presentation
+        return presentations.Item(1)
+
     def set_background_color(self, color: str, slide_index: List[int] = None) -> str:
         """
         Set the background color of the slide(s).
@@ -102,11 +235,15 @@ class PowerPointWinCOMReceiver(WinCOMReceiverBasic):
         :return: The result of setting the background color.
         """
         try:
-            if self.com_object is None:
+            presentation = self.com_object
+            if presentation is None:
                 return "Error: No active PowerPoint presentation found."
             
+            slides = presentation.Slides
+            slide_count = slides.Count
+
             if not slide_index:
-                slide_index = range(1, self.com_object.Slides.Count + 1)
+                slide_index = range(1, slide_count + 1)
 
             # Remove '#' if present and validate hex color
             if color.startswith('#'):
@@ -115,26 +252,40 @@ class PowerPointWinCOMReceiver(WinCOMReceiverBasic):
             if len(color) != 6:
                 return f"Invalid hex color code: {color}. Please use 6-digit hex format (e.g., 'FF0000' for red)."
 
-            red = int(color[0:2], 16)
-            green = int(color[2:4], 16)
-            blue = int(color[4:6], 16)
-            bgr_hex = (blue << 16) + (green << 8) + red
+            try:
+                rgb = int(color, 16)
+            except ValueError:
+                return f"Invalid hex color code: {color}. Please use 6-digit hex format (e.g., 'FF0000' for red)."
 
-            modified_slides = []
-            for index in slide_index:
-                if index < 1 or index > self.com_object.Slides.Count:
-                    print(f"DEBUG: Skipping invalid slide index: {index}")
-                    continue
-                
+            # Swap the red and blue bytes, PowerPoint expects BGR
+            bgr_hex = ((rgb & 0xFF) << 16) | (rgb & 0xFF00) | (rgb >> 16)
+
+            # Filter the slide indexes once, so the COM loop only visits valid slides
+            valid_slides = [index for index in slide_index if 1 <= index <= slide_count]
+            if len(valid_slides) != len(slide_index):
+                logger.debug(
+                    "Skipping invalid slide index(es): %s",
+                    [index for index in slide_index if not 1 <= index <= slide_count],
+                )
+
+            failed_slides = []
+            for index in valid_slides:
                 try:
-                    slide = self.com_object.Slides(index)
+                    slide = slides(index)
                     slide.FollowMasterBackground = False
-                    slide.Background.Fill.Visible = True
-                    slide.Background.Fill.Solid()
-                    slide.Background.Fill.ForeColor.RGB = bgr_hex  # PowerPoint uses BGR format
-                    modified_slides.append(index)
+                    fill = slide.Background.Fill
+                    fill.Visible = True
+                    fill.Solid()
+                    fill.ForeColor.RGB = bgr_hex  # PowerPoint uses BGR format
                 except Exception as e:
-                    print(f"DEBUG: Failed to set background for slide {index}: {e}")
+                    logger.debug("Failed to set background for slide %s: %s", index, e)
+                    failed_slides.append(index)
+
+            if failed_slides:
+                failed = set(failed_slides)
+                modified_slides = [index for index in valid_slides if index not in failed]
+            else:
+                modified_slides = valid_slides
                     
             if modified_slides:
                 return f"Successfully set the background color to #{color} for slide(s) {modified_slides}."
@@ -156,91 +307,73 @@ class PowerPointWinCOMReceiver(WinCOMReceiverBasic):
         :return: Success message or error details.
         """
 
-        ppt_ext_to_fileformat = {
-            ".pptx": 24,  # PowerPoint Presentation (OpenXML)
-            ".ppt": 0,  # PowerPoint 97-2003 Presentation
-            ".pdf": 32,  # PDF file
-            ".xps": 33,  # XPS file
-            ".potx": 25,  # PowerPoint Template (OpenXML)
-            ".pot": 5,  # PowerPoint 97-2003 Template
-            ".ppsx": 27,  # PowerPoint Show (OpenXML)
-            ".pps": 1,  # PowerPoint 97-2003 Show
-            ".odp": 35,  # OpenDocument Presentation
-            ".jpg": 17,  # JPG images (slides exported as .jpg)
-            ".png": 18,  # PNG images
-            ".gif": 19,  # GIF images
-            ".bmp": 20,  # BMP images
-            ".tif": 21,  # TIFF images
-            ".tiff": 21,  # TIFF images
-            ".rtf": 6,  # Outline RTF
-            ".html": 12,  # Single File Web Page
-            ".mp4": 39,  # MPEG-4 video (requires PowerPoint 2013+)
-            ".wmv": 38,  # Windows Media Video
-            ".xml": 10,  # PowerPoint 2003 XML Presentation
-        }
-
-        ppt_ext_to_formatstr = {
-            ".jpg": "JPG",  # JPG images (slides exported as .jpg)
-            ".png": "PNG",  # PNG images
-            ".gif": "GIF",  # GIF images
-            ".bmp": "BMP",  # BMP images
-            ".tif": "TIF",  # TIFF images
-            ".tiff": "TIF",  # TIFF images
-        }
+        if not file_ext:
+            file_ext = ".pptx"  # Default to pptx
+        elif not file_ext.startswith('.'):
+            file_ext = '.' + file_ext
+
+        # Reject unsupported extensions before touching the file system
+        if file_ext.lower() not in _PPT_EXT_TO_FILEFORMAT:
+            return f"Unsupported file extension: {file_ext}. Supported extensions: {', '.join(_PPT_EXT_TO_FILEFORMAT)}"
+
+        presentation = self.com_object
+        full_name = getattr(presentation, "FullName", "") if presentation is not None else ""
 
         # Enhanced path handling
         if not file_dir:
-            if hasattr(self.com_object, 'FullName') and self.com_object.FullName:
-                file_dir = os.path.dirname(self.com_object.FullName)
+            if full_name:
+                file_dir = os.path.dirname(full_name)
             else:
                 file_dir = self.get_safe_desktop_path()
         else:
-            # Expand environment variables
-            file_dir = os.path.expandvars(file_dir)
-            # Expand user home directory
-            file_dir = os.path.expanduser(file_dir)
+            # Expand environment variables and the user home directory, only when present
+            if "%" in file_dir or "$" in file_dir:
+                file_dir = os.path.expandvars(file_dir)
+            if file_dir.startswith("~"):
+                file_dir = os.path.expanduser(file_dir)
             
-        print(f"DEBUG: Resolved file_dir: {file_dir}")
+        logger.debug("Resolved file_dir: %s", file_dir)
             
         if not file_name:
-            if hasattr(self.com_object, 'FullName') and self.com_object.FullName:
-                file_name = os.path.splitext(os.path.basename(self.com_object.FullName))[0]
+            if full_name:
+                file_name = os.path.splitext(os.path.basename(full_name))[0]
             else:
                 file_name = f"powerpoint_presentation_{int(time.time())}"
             
-        if not file_ext:
-            file_ext = ".pptx"  # Default to pptx
-        elif not file_ext.startswith('.'):
-            file_ext = '.' + file_ext
-
         # Validate and create directory if needed
         try:
             Path(file_dir).mkdir(parents=True, exist_ok=True)
-            print(f"DEBUG: Directory ensured: {file_dir}")
+            logger.debug("Directory ensured: %s", file_dir)
         except Exception as e:
-            print(f"DEBUG: Cannot create directory {file_dir}: {e}")
+            logger.debug("Cannot create directory %s: %s", file_dir, e)
             # Fallback to user's Documents folder
-            file_dir = os.path.join(os.path.expanduser("~"), "Documents")
+            file_dir = _DOCS
             try:
                 Path(file_dir).mkdir(parents=True, exist_ok=True)
-                print(f"DEBUG: Fallback to Documents: {file_dir}")
+                logger.debug("Fallback to Documents: %s", file_dir)
             except Exception:
                 # Final fallback to temp directory
+
                 file_dir = tempfile.gettempdir()
-                print(f"DEBUG: Final fallback to temp: {file_dir}")
+                logger.debug("Final fallback to temp: %s", file_dir)
+
+        # Generate unique filename if file exists, scanning the directory only once
+        try:
+            with os.scandir(file_dir) as entries:
+                # Windows file names are case-insensitive
+                existing = {entry.name.lower() for entry in entries}
+        except OSError:
+            existing = set()
 
-        # Generate unique filename if file exists
-        base_file_path = os.path.join(file_dir, file_name + file_ext)
-        file_path = base_file_path
+        candidate = file_name + file_ext
         counter = 1
-        
-        while os.path.exists(file_path):
-            name_with_counter = f"{file_name}_{counter}"
-            file_path = os.path.join(file_dir, name_with_counter + file_ext)
+        while candidate.lower() in existing:
+            candidate = f"{file_name}_{counter}{file_ext}"
             counter += 1
+        file_path = os.path.join(file_dir, candidate)
 
-        if file_path != base_file_path:
-            print(f"DEBUG: File exists, using unique name: {file_path}")
+        if counter > 1:
+            logger.debug("File exists, using unique name: %s", file_path)
 
         try:
             # Check if com_object exists
@@ -248,179 +381,308 @@ class PowerPointWinCOMReceiver(WinCOMReceiverBasic):
                 return "Error: No active PowerPoint presentation found."
             
             # Attempt to save with different methods
-            return self._attempt_save_with_fallback(file_path, file_ext, current_slide_only, ppt_ext_to_fileformat, ppt_ext_to_formatstr)
+            return self._attempt_save_with_fallback(file_path, file_ext, current_slide_only)
             
         except Exception as e:
             return f"Failed to save the presentation to {file_path}. Error: {str(e)}"
 
-    def _attempt_save_with_fallback(self, file_path: str, file_ext: str, current_slide_only: bool, format_map: dict, export_map: dict) -> str:
+    # The save strategies in fallback order, each returns a result message on success or None on failure.
+    _SAVE_STRATEGIES = (
+        "_save_by_export",
+        "_save_by_saveas",
+        "_save_by_saveas_auto",
+        "_save_by_fixed_format",
+        "_save_by_save_copy",
+        "_save_by_reopen",
+        "_save_by_copy",
+    )
+
+    def _attempt_save_with_fallback(self, file_path: str, file_ext: str, current_slide_only: bool) -> str:
         """
         Attempt to save with multiple fallback strategies.
+        The strategies are always tried in the fixed _SAVE_STRATEGIES order, so a fallback that
+        succeeded once never takes precedence over the safer strategies on later saves. Only the
+        strategies that apply to the extension are cached.
         """
-        # Method 1: Export single slide (for image formats)
-        if file_ext in export_map.keys():
-            try:
-                if self.com_object.Slides.Count == 1 or current_slide_only:
-                    if current_slide_only:
-                        try:
-                            # Try to get current slide from slideshow
-                            current_slide_idx = self.com_object.SlideShowWindow.View.Slide.SlideIndex
-                        except:
-                            # If no slideshow is running, use first slide
-                            current_slide_idx = 1
-                    else:
+        ext_key = file_ext.lower()
+        strategies = self._save_plans.get(ext_key)
+        if strategies is None:
+            strategies = self._save_plans[ext_key] = self._build_save_plan(ext_key)
+
+        for name in strategies:
+            result = getattr(self, name)(file_path, file_ext, current_slide_only)
+            if result is not None:
+                return result
+
+        # Final fallback: save as default PowerPoint format in Documents
+        try:
+            fallback_path = os.path.join(
+                _DOCS, f"UFO_PowerPoint_Export_{int(time.time())}.pptx"
+            )
+            self.com_object.SaveAs(fallback_path, FileFormat=24)
+            return f"Presentation saved to fallback location: {fallback_path}"
+        except Exception as e:
+            return f"All save methods failed. Last error: {str(e)}"
+
+    def _build_save_plan(self, ext_key: str) -> Tuple[str, ...]:
+        """
+        Select the save strategies that apply to a file extension, so the
+        extension checks run once per extension rather than on every save.
+        :param ext_key: The lower-cased file extension.
+        :return: The names of the applicable strategies in fallback order.
+        """
+        skipped = set()
+        if ext_key not in _PPT_EXT_TO_FORMATSTR:
+            skipped.add("_save_by_export")
+        if ext_key not in (".pdf", ".xps"):
+            skipped.add("_save_by_fixed_format")
+        return tuple(name for name in self._SAVE_STRATEGIES if name not in skipped)
+
+    def _save_by_export(self, file_path: str, file_ext: str, current_slide_only: bool) -> Optional[str]:
+        """
+        Export the current slide, or every slide as an individual file (for image formats).
+        """
+        presentation = self.com_object
+        try:
+            slides = presentation.Slides
+            slide_count = slides.Count
+            if slide_count == 1 or current_slide_only:
+                if current_slide_only:
+                    try:
+                        # Try to get current slide from slideshow
+                        current_slide_idx = presentation.SlideShowWindow.View.Slide.SlideIndex
+                    except:
+                        # If no slideshow is running, use first slide
                         current_slide_idx = 1
-                    
-                    self.com_object.Slides(current_slide_idx).Export(
-                        file_path, export_map.get(file_ext, "PNG")
-                    )
-                    
-                    if os.path.exists(file_path):
-                        file_size = os.path.getsize(file_path)
-                        return f"Slide {current_slide_idx} successfully exported to {file_path} (Size: {file_size} bytes)"
-                    else:
-                        return f"Export completed but file not found at {file_path}"
-                        
                 else:
-                    # Export all slides as individual files
-                    base_name = os.path.splitext(file_path)[0]
-                    exported_files = []
-                    
-                    for i in range(1, self.com_object.Slides.Count + 1):
-                        slide_path = f"{base_name}_slide_{i}{file_ext}"
-                        self.com_object.Slides(i).Export(slide_path, export_map.get(file_ext, "PNG"))
-                        if os.path.exists(slide_path):
-                            exported_files.append(slide_path)
+                    current_slide_idx = 1
+                
+                slides(current_slide_idx).Export(
+                    file_path, _PPT_EXT_TO_FORMATSTR.get(file_ext.lower(), "PNG")
+                )
+                self._log_saved_file(file_path)
+                return f"Slide {current_slide_idx} successfully exported to {file_path}"
                     
-                    if exported_files:
-                        return f"Successfully exported {len(exported_files)} slides to {os.path.dirname(file_path)}"
-                    else:
-                        return "Export completed but no files found"
-                        
-            except Exception as e1:
-                print(f"DEBUG: Export method failed: {e1}")
-        
-        # Method 2: Standard SaveAs
-        try:
-            file_format = format_map.get(file_ext.lower(), 24)  # Default to pptx
-            self.com_object.SaveAs(file_path, FileFormat=file_format)
-            
-            if os.path.exists(file_path):
-                file_size = os.path.getsize(file_path)
-                return f"Presentation successfully saved to {file_path} (Size: {file_size} bytes)"
             else:
-                return f"SaveAs completed but file not found at {file_path}"
-                
-        except Exception as e2:
-            print(f"DEBUG: Standard SaveAs failed: {e2}")
-            
-            # Method 3: SaveAs without FileFormat parameter (let PowerPoint decide)
-            try:
-                self.com_object.SaveAs(file_path)
-                if os.path.exists(file_path):
-                    return f"Presentation successfully saved to {file_path} (auto-format)"
-                else:
-                    return f"Auto-format save completed but file not found"
-            except Exception as e3:
-                print(f"DEBUG: Auto-format SaveAs failed: {e3}")
+                # Export all slides as individual files
+                base_name = os.path.splitext(file_path)[0]
+                slide_paths = [
+                    f"{base_name}_slide_{i}{file_ext}" for i in range(1, slide_count + 1)
+                ]
+                self._export_slides(
+                    slides, slide_paths, _PPT_EXT_TO_FORMATSTR.get(file_ext.lower(), "PNG")
+                )
                 
-                # Method 4: Export as fixed format for PDF/XPS
-                if file_ext.lower() in ['.pdf', '.xps']:
-                    try:
-                        export_format = 2 if file_ext.lower() == '.pdf' else 4  # ppFixedFormatTypePDF, ppFixedFormatTypeXPS
-                        self.com_object.ExportAsFixedFormat(
-                            Path=file_path,
-                            FixedFormatType=export_format,
-                            Intent=1,  # ppFixedFormatIntentPrint
-                            FrameSlides=False,
-                            HandoutOrder=1,  # ppPrintHandoutOrderHorizontalFirst
-                            OutputType=1,  # ppPrintOutputSlides
-                            PrintHiddenSlides=False,
-                            PrintRange=None,
-                            RangeType=1,  # ppPrintAll
-                            SlideShowName="",
-                            IncludeDocProps=True,
-                            KeepIRMSettings=True,
-                            DocStructureTags=True,
-                            BitmapMissingFonts=True,
-                            UseISO19005_1=False
-                        )
-                        
-                        if os.path.exists(file_path):
-                            return f"Presentation successfully exported to {file_path}"
-                        else:
-                            return f"Export completed but file not found"
-                    except Exception as e4:
-                        print(f"DEBUG: Export as fixed format failed: {e4}")
-                
-                # Method 5: Copy and save approach
-                try:
-                    # Create a new presentation and copy content
-                    new_presentation = self.client.Presentations.Add()
-                    
-                    # Copy all slides from original presentation
-                    for i in range(1, self.com_object.Slides.Count + 1):
-                        self.com_object.Slides(i).Copy()
-                        new_presentation.Slides.Paste()
-                    
-                    # Remove the default empty slide
-                    if new_presentation.Slides.Count > self.com_object.Slides.Count:
-                        new_presentation.Slides(1).Delete()
+                return f"Successfully exported {slide_count} slides to {os.path.dirname(file_path)}"
                     
-                    # Save the new presentation
-                    new_presentation.SaveAs(file_path, FileFormat=format_map.get(file_ext.lower(), 24))
-                    new_presentation.Close()
-                    
-                    if os.path.exists(file_path):
-                        return f"Presentation successfully saved to {file_path} (copy method)"
-                    else:
-                        return f"Copy method completed but file not found"
-                        
-                except Exception as e5:
-                    print(f"DEBUG: Copy method failed: {e5}")
+        except Exception as e:
+            logger.debug("Export method failed: %s", e)
+            return None
+
+    def _export_slides(self, slides, slide_paths: List[str], format_str: str) -> None:
+        """
+        Export the slides to the given paths, slide i to slide_paths[i - 1].
+        When the target directory is on another volume than the temp directory (e.g. a network drive),
+        the slides are exported to a local staging directory first and then moved over in one pass.
+        :param slides: The slides collection of the presentation.
+        :param slide_paths: The output path of each slide.
+        :param format_str: The graphics filter name of the export.
+        """
+        staging_dir = self._create_staging_dir(os.path.dirname(slide_paths[0]))
+        if staging_dir is None:
+            self._export_slides_to(slides, slide_paths, format_str)
+            return
+
+        try:
+            staged_paths = [
+                os.path.join(staging_dir, os.path.basename(slide_path))
+                for slide_path in slide_paths
+            ]
+            self._export_slides_to(slides, staged_paths, format_str)
+            for staged_path, slide_path in zip(staged_paths, slide_paths):
+                shutil.move(staged_path, slide_path)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    @staticmethod
+    def _create_staging_dir(target_dir: str) -> Optional[str]:
+        """
+        Create a local staging directory for exports to a directory on another volume.
+        :param target_dir: The directory the exported files end up in.
+        :return: The staging directory, or None if the target is on the same volume as the temp directory.
+        """
+
+        temp_dir = tempfile.gettempdir()
+        try:
+            if os.stat(temp_dir).st_dev == os.stat(target_dir).st_dev:
+                return None
+            return tempfile.mkdtemp(prefix="ufo_ppt_export_")
+        except OSError as e:
+            logger.debug("Cannot stage export for %s: %s", target_dir, e)
+            return None
+
+    def _export_slides_to(self, slides, slide_paths: List[str], format_str: str) -> None:
+        """
+        Export the slides to the given paths, slide i to slide_paths[i - 1].
+        The exports run serially, PowerPoint serves COM calls on a single apartment thread.
+        :param slides: The slides collection of the presentation.
+        :param slide_paths: The output path of each slide.
+        :param format_str: The graphics filter name of the export.
+        """
+        for i, slide_path in enumerate(slide_paths, 1):
+            slides(i).Export(slide_path, format_str)
+            self._log_saved_file(slide_path)
+
+    def _save_by_saveas(self, file_path: str, file_ext: str, current_slide_only: bool) -> Optional[str]:
+        """
+        Standard SaveAs with the file format of the extension.
+        """
+        try:
+            file_format = _PPT_EXT_TO_FILEFORMAT.get(file_ext.lower(), 24)  # Default to pptx
+            self.com_object.SaveAs(file_path, FileFormat=file_format)
+            self._log_saved_file(file_path)
+            return f"Presentation successfully saved to {file_path}"
                 
-                # Final fallback: save as default PowerPoint format in Documents
+        except Exception as e:
+            logger.debug("Standard SaveAs failed: %s", e)
+            return None
+
+    def _save_by_saveas_auto(self, file_path: str, file_ext: str, current_slide_only: bool) -> Optional[str]:
+        """
+        SaveAs without FileFormat parameter (let PowerPoint decide).
+        """
+        try:
+            self.com_object.SaveAs(file_path)
+            self._log_saved_file(file_path)
+            return f"Presentation successfully saved to {file_path} (auto-format)"
+        except Exception as e:
+            logger.debug("Auto-format SaveAs failed: %s", e)
+            return None
+
+    def _save_by_fixed_format(self, file_path: str, file_ext: str, current_slide_only: bool) -> Optional[str]:
+        """
+        Export as fixed format for PDF/XPS.
+        """
+        try:
+            export_format = 2 if file_ext.lower() == '.pdf' else 4  # ppFixedFormatTypePDF, ppFixedFormatTypeXPS
+            self.com_object.ExportAsFixedFormat(
+                Path=file_path,
+                FixedFormatType=export_format,
+                Intent=1,  # ppFixedFormatIntentPrint
+                FrameSlides=False,
+                HandoutOrder=1,  # ppPrintHandoutOrderHorizontalFirst
+                OutputType=1,  # ppPrintOutputSlides
+                PrintHiddenSlides=False,
+                PrintRange=None,
+                RangeType=1,  # ppPrintAll
+                SlideShowName="",
+                IncludeDocProperties=True,
+                KeepIRMSettings=True,
+                DocStructureTags=True,
+                BitmapMissingFonts=True,
+                UseISO19005_1=False
+            )
+            self._log_saved_file(file_path)
+            return f"Presentation successfully exported to {file_path}"
+        except Exception as e:
+            logger.debug("Export as fixed format failed: %s", e)
+            return None
+
+    def _save_by_save_copy(self, file_path: str, file_ext: str, current_slide_only: bool) -> Optional[str]:
+        """
+        Save a copy of the in-memory presentation in one call,
+        without the per-slide clipboard round-trips of the copy method.
+        """
+        try:
+            self.com_object.SaveCopyAs(
+                file_path, _PPT_EXT_TO_FILEFORMAT.get(file_ext.lower(), 24)
+            )
+            self._log_saved_file(file_path)
+            return f"Presentation successfully saved to {file_path} (save copy method)"
+        except Exception as e:
+            logger.debug("SaveCopyAs failed: %s", e)
+        return None
+
+    def _save_by_reopen(self, file_path: str, file_ext: str, current_slide_only: bool) -> Optional[str]:
+        """
+        Reopen the saved source file as an untitled, windowless copy and save that.
+        The copy comes from disk, so unsaved in-memory changes are not included.
+        """
+        try:
+            source_path = self.com_object.FullName
+            has_unsaved_changes = not self.com_object.Saved
+            if source_path and os.path.isfile(source_path):
+                duplicate = self.client.Presentations.Open(
+                    source_path, ReadOnly=-1, Untitled=-1, WithWindow=0
+                )
                 try:
-                    fallback_path = os.path.join(
-                        os.path.expanduser("~"), "Documents", 
-                        f"UFO_PowerPoint_Export_{int(time.time())}.pptx"
+                    duplicate.SaveAs(
+                        file_path,
+                        FileFormat=_PPT_EXT_TO_FILEFORMAT.get(file_ext.lower(), 24),
                     )
-                    self.com_object.SaveAs(fallback_path, FileFormat=24)
-                    return f"Presentation saved to fallback location: {fallback_path}"
-                except Exception as e6:
-                    return f"All save methods failed. Last error: {str(e6)}"
+                finally:
+                    duplicate.Close()
+                self._log_saved_file(file_path)
+                if has_unsaved_changes:
+                    return (
+                        f"Only the last saved version of the presentation was exported to {file_path} "
+                        "(reopen method), unsaved changes are not included"
+                    )
+                return f"Presentation successfully saved to {file_path} (reopen method)"
+        except Exception as e:
+            logger.debug("Reopen method failed: %s", e)
+        return None
 
-    def get_safe_desktop_path(self) -> str:
+    def _save_by_copy(self, file_path: str, file_ext: str, current_slide_only: bool) -> Optional[str]:
         """
-        Get a safe desktop path for saving files.
+        Copy all slides into a new presentation and save that.
         """
         try:
-            # Try multiple methods to get desktop path
-            desktop_paths = [
-                os.path.join(os.path.expanduser("~"), "Desktop"),
-                os.path.join(os.path.expandvars("%USERPROFILE%"), "Desktop"),
-                os.path.join(os.path.expandvars("%HOMEDRIVE%"), os.path.expandvars("%HOMEPATH%"), "Desktop"),
-                os.path.join(os.path.expanduser("~"), "桌面"),  # 中文系统
-            ]
+            # Create a new presentation and copy content
+            new_presentation = self.client.Presentations.Add()
             
-            for path in desktop_paths:
-                if os.path.exists(path) and os.access(path, os.W_OK):
-                    print(f"DEBUG: Found desktop at: {path}")
-                    return path
+            # Copy all slides from original presentation
+            slides = self.com_object.Slides
+            slide_count = slides.Count
+            new_slides = new_presentation.Slides
+            for i in range(1, slide_count + 1):
+                slides(i).Copy()
+                new_slides.Paste()
             
-            # Fallback to Documents
-            docs_path = os.path.join(os.path.expanduser("~"), "Documents")
-            if os.path.exists(docs_path):
-                print(f"DEBUG: Fallback to Documents: {docs_path}")
-                return docs_path
-            
-            # Final fallback to user home
-            return os.path.expanduser("~")
+            # Remove the default empty slide
+            if new_slides.Count > slide_count:
+                new_slides(1).Delete()
             
+            # Save the new presentation
+            new_presentation.SaveAs(file_path, FileFormat=_PPT_EXT_TO_FILEFORMAT.get(file_ext.lower(), 24))
+            new_presentation.Close()
+            self._log_saved_file(file_path)
+            return f"Presentation successfully saved to {file_path} (copy method)"
+                
         except Exception as e:
-            print(f"DEBUG: Error getting desktop path: {e}")
-            # Final fallback to temp directory
-            return tempfile.gettempdir()
+            logger.debug("Copy method failed: %s", e)
+            return None
+
+    @staticmethod
+    def _log_saved_file(file_path: str) -> None:
+        """
+        Log the size of a saved file. The COM call raises on failure, so the file
+        is only inspected for diagnostics when debug logging is enabled.
+        :param file_path: The path of the saved file.
+        """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        try:
+            logger.debug("Saved %s (Size: %d bytes)", file_path, os.path.getsize(file_path))
+        except OSError:
+            logger.debug("Save returned but file not found at %s", file_path)
+
+    def get_safe_desktop_path(self) -> str:
+        """
+        Get a safe desktop path for saving files.
+        The path is resolved once per process and reused afterwards.
+        """
+        return _resolve_desktop_path()
 
     @property
     def type_name(self):
@@ -437,6 +699,8 @@ class SetBackgroundColorCommand(WinCOMCommand):
     The command to set the background color of the slide(s).
     """
 
+    __slots__ = ()
+
     def execute(self):
         """
         Execute the command to set the background color of the slide(s).
@@ -464,6 +728,8 @@ class SaveAsCommand(WinCOMCommand):
     The command to save the document to various formats.
     """
 
+    __slots__ = ()
+
     def execute(self):
         """
         Execute the command to save the document to specified format.
@@ -480,11 +746,11 @@ class SaveAsCommand(WinCOMCommand):
         current_slide_only = self.params.get("current_slide_only", False)
         
         # Handle special path cases
-        if file_dir and "%USERNAME%" in file_dir:
+        if file_dir and "%" in file_dir and _USERNAME_PATTERN.search(file_dir):
             # Replace %USERNAME% with actual username
-            username = getpass.getuser()
-            file_dir = file_dir.replace("%USERNAME%", username)
-            print(f"DEBUG: Resolved %USERNAME% to: {file_dir}")
+            username = _get_username()
+            file_dir = _USERNAME_PATTERN.sub(lambda _: username, file_dir)
+            logger.debug("Resolved %%USERNAME%% to: %s", file_dir)
         
         # Ensure file extension starts with dot
         if file_ext and not file_ext.startswith('.'):
@@ -493,7 +759,7 @@ class SaveAsCommand(WinCOMCommand):
         # Use safe desktop path if specified but invalid
         if file_dir and "Desktop" in file_dir and not os.path.exists(file_dir):
             file_dir = self.receiver.get_safe_desktop_path()
-            print(f"DEBUG: Desktop fallback: {file_dir}")
+            logger.debug("Desktop fallback: %s", file_dir)
         
         try:
             result = self.receiver.save_as(
@@ -1,16 +1,102 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
+import functools
+import logging
 import os
 import time
 import tempfile
 from pathlib import Path
-import getpass
-from typing import Dict, Type
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Type
 
 from ufo.automator.app_apis.basic import WinCOMCommand, WinCOMReceiverBasic
 from ufo.automator.basic import CommandBasic
 
+logger = logging.getLogger(__name__)
+
+_WORD_EXT_TO_FILEFORMAT: Mapping[str, int] = MappingProxyType(
+    {
+        ".doc": 0,  # Word 97-2003 Document
+        ".dot": 1,  # Word 97-2003 Template
+        ".txt": 2,  # Plain Text (ASCII)
+        ".rtf": 6,  # Rich Text Format (RTF)
+        ".unicode.txt": 7,  # Unicode Text (custom extension, for clarity)
+        ".htm": 8,  # Web Page (HTML)
+        ".html": 8,  # Web Page (HTML)
+        ".mht": 9,  # Single File Web Page (MHT)
+        ".xml": 11,  # Word 2003 XML Document
+        ".docx": 12,  # Word Document (default)
+        ".docm": 13,  # Word Macro-Enabled Document
+        ".dotx": 14,  # Word Template (no macros)
+        ".dotm": 15,  # Word Macro-Enabled Template
+        ".pdf": 17,  # PDF File
+        ".xps": 18,  # XPS File
+    }
+)
+
+# The static ExportAsFixedFormat options for PDF/XPS, the output path and format are passed per call.
+_WORD_FIXED_FORMAT_OPTIONS: Mapping[str, object] = MappingProxyType(
+    {
+        "OpenAfterExport": False,
+        "OptimizeFor": 0,  # wdExportOptimizeForPrint
+        "BitmapMissingFonts": True,
+        "DocStructureTags": True,
+        "CreateBookmarks": 0,  # wdExportDocumentContent
+        "UseISO19005_1": False,
+    }
+)
+
+_HOME = os.path.expanduser("~")
+_DOCS = os.path.join(_HOME, "Documents")
+
+# Desktop path candidates in lookup order, built once from the environment at import.
+_DESKTOP_CANDIDATES = tuple(
+    dict.fromkeys(
+        path
+        for path in (
+            os.path.join(_HOME, "Desktop"),
+            os.environ.get("USERPROFILE")
+            and os.path.join(os.environ["USERPROFILE"], "Desktop"),
+            os.environ.get("HOMEPATH")
+            and os.path.join(
+                os.environ.get("HOMEDRIVE", ""), os.environ["HOMEPATH"], "Desktop"
+            ),
+            os.path.join(_HOME, "桌面"),  # 中文系统
+        )
+        if path
+    )
+)
+
+# Process names that mean "any Word document" rather than a specific file.
+_WORD_PROCESS_NAMES = frozenset({"word", "winword", "microsoft word"})
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_desktop_path() -> str:
+    """
+    Resolve a writable desktop path, falling back to Documents, the home directory and the temp directory.
+    """
+    try:
+        # os.access is False for a missing path, so no separate existence check is needed
+        for path in _DESKTOP_CANDIDATES:
+            if os.access(path, os.W_OK):
+                logger.debug("Found desktop at: %s", path)
+                return path
+        
+        # Fallback to Documents
+        if os.path.exists(_DOCS):
+            logger.debug("Fallback to Documents: %s", _DOCS)
+            return _DOCS
+        
+        # Final fallback to user home
+        return _HOME
+        
+    except Exception as e:
+        logger.debug("Error getting desktop path: %s", e)
+        # Final fallback to temp directory
+        return tempfile.gettempdir()
+
 
 class WordWinCOMReceiver(WinCOMReceiverBasic):
     """
@@ -25,18 +111,29 @@ class WordWinCOMReceiver(WinCOMReceiverBasic):
         :return: The matched object.
         """
         try:
-            print(f"DEBUG: Starting Word get_object_from_process_name")
+            logger.debug("Starting Word get_object_from_process_name")
             
             if not self.client:
-                print("DEBUG: Word client is None, returning None")
+                logger.debug("Word client is None, returning None")
                 return None
             
             # 获取所有文档
             documents = self.client.Documents
-            print(f"DEBUG: Documents collection count = {documents.Count}")
+            doc_count = documents.Count
+            logger.debug("Documents collection count = %s", doc_count)
+
+            # 没有打开的文档时无需再枚举集合
+            if doc_count == 0:
+                logger.debug("No documents open, returning None")
+                return None
+
+            # 只枚举一次集合，同时记录名称和文档对象，后续匹配直接复用
+            docs_list = list(documents)
+            name_to_doc = {}
+            for doc in docs_list:
+                name_to_doc.setdefault(doc.Name, doc)
             
-            object_name_list = [doc.Name for doc in documents]
-            print(f"DEBUG: Documents collection = {object_name_list}")
+            object_names = tuple(name_to_doc)
             
             # 如果没有打开的文档，创建一个新文档
             # if documents.Count == 0:
@@ -50,36 +147,36 @@ class WordWinCOMReceiver(WinCOMReceiverBasic):
             #         return None
             
             # 如果有文档，尝试匹配
-            matched_object = self.app_match(object_name_list)
-            print(f"DEBUG: app_match result = {matched_object}")
+            matched_object = self.app_match(object_names)
+            logger.debug("app_match result = %s", matched_object)
             
             # 如果process_name只是"Word"或匹配失败，返回第一个文档
-            if (self.process_name.lower() in ["word", "winword", "microsoft word"] or 
+            if (self.process_name.lower() in _WORD_PROCESS_NAMES or 
                 not matched_object):
-                if documents.Count > 0:
-                    first_document = documents.Item(1)
-                    print(f"DEBUG: Returning first document: {first_document.Name}")
-                    return first_document
+                if docs_list:
+                    logger.debug("Returning first document")
+                    return docs_list[0]
             
             # 尝试找到匹配的文档
-            for doc in documents:
-                if doc.Name == matched_object:
-                    print(f"DEBUG: Found matched document: {doc.Name}")
-                    return doc
+            matched_doc = name_to_doc.get(matched_object)
+            if matched_doc is not None:
+                logger.debug("Found matched document: %s", matched_object)
+                return matched_doc
             
             # 如果都失败了，返回第一个文档
-            if documents.Count > 0:
-                first_document = documents.Item(1)
-                print(f"DEBUG: Fallback: returning first document: {first_document.Name}")
-                return first_document
+            if docs_list:
+                logger.debug("Fallback: returning first document")
+                return docs_list[0]
             
-            print("DEBUG: No documents available and failed to create new one")
+            logger.debug("No documents available and failed to create new one")
             return None
             
         except Exception as e:
-            print(f"DEBUG: Exception in Word get_object_from_process_name: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.debug(
+                "Exception in Word get_object_from_process_name: %s",
+                e,
+                exc_info=True,
+            )
             return None
 
     def insert_table(self, rows: int, columns: int) -> object:
@@ -90,21 +187,24 @@ class WordWinCOMReceiver(WinCOMReceiverBasic):
         :return: The inserted table.
         """
 
+        document = self.com_object
+
         # Get the range at the end of the document
-        end_range = self.com_object.Range()
+        end_range = document.Range()
         end_range.Collapse(0)  # Collapse the range to the end
 
         # Insert a paragraph break (optional)
         end_range.InsertParagraphAfter()
-        table = self.com_object.Tables.Add(end_range, rows, columns)
+        table = document.Tables.Add(end_range, rows, columns)
         table.Borders.Enable = True
 
         return table
 
-    def select_text(self, text: str) -> None:
+    def select_text(self, text: str) -> str:
         """
         Select the text in the document.
         :param text: The text to be selected.
+        :return: The result message of the selection.
         """
         finder = self.com_object.Range().Find
         finder.Text = text
@@ -124,30 +224,48 @@ class WordWinCOMReceiver(WinCOMReceiverBasic):
         :param end_index: The end index of the paragraph, if ==-1, select to the end of the document.
         :param non_empty: Whether to select the non-empty paragraphs only.
         """
-        paragraphs = self.com_object.Paragraphs
+        document = self.com_object
+        paragraphs = document.Paragraphs
 
         start_index = max(1, start_index)
 
         if non_empty:
-            paragraphs = [p for p in paragraphs if p.Range.Text.strip()]
+            # Only scan as far as the last paragraph needed, keeping the ranges of the non-empty ones
+            needed = start_index if end_index == -1 else max(start_index, end_index)
+            ranges = []
+            for paragraph in paragraphs:
+                paragraph_range = paragraph.Range
+                if paragraph_range.Text.strip():
+                    ranges.append(paragraph_range)
+                    if len(ranges) == needed:
+                        break
+
+            start_range = ranges[start_index - 1]
+            end_range = ranges[end_index - 1] if end_index != -1 else None
+        else:
+            # Index the two paragraphs directly instead of walking the collection
+            start_range = paragraphs(start_index).Range
+            end_range = paragraphs(end_index).Range if end_index != -1 else None
 
-        para_start = paragraphs[start_index - 1].Range.Start
+        para_start = start_range.Start
 
         # Select to the end of the document if end_index == -1
-        if end_index == -1:
-            para_end = self.com_object.Range().End
+        if end_range is None:
+            para_end = document.Range().End
         else:
-            para_end = paragraphs[end_index - 1].Range.End
+            para_end = end_range.End
 
-        self.com_object.Range(para_start, para_end).Select()
+        document.Range(para_start, para_end).Select()
 
-    def select_table(self, number: int) -> None:
+    def select_table(self, number: int) -> str:
         """
         Select a table in the document.
         :param number: The number of the table.
+        :return: The result message of the selection.
         """
         tables = self.com_object.Tables
-        if not number or number < 1 or number > tables.Count:
+        count = tables.Count
+        if not number or number < 1 or number > count:
             return f"Table number {number} is out of range."
 
         tables(number).Select()
@@ -194,41 +312,24 @@ class WordWinCOMReceiver(WinCOMReceiverBasic):
         :return: Success message or error details.
         """
 
-        word_ext_to_fileformat = {
-            ".doc": 0,  # Word 97-2003 Document
-            ".dot": 1,  # Word 97-2003 Template
-            ".txt": 2,  # Plain Text (ASCII)
-            ".rtf": 6,  # Rich Text Format (RTF)
-            ".unicode.txt": 7,  # Unicode Text (custom extension, for clarity)
-            ".htm": 8,  # Web Page (HTML)
-            ".html": 8,  # Web Page (HTML)
-            ".mht": 9,  # Single File Web Page (MHT)
-            ".xml": 11,  # Word 2003 XML Document
-            ".docx": 12,  # Word Document (default)
-            ".docm": 13,  # Word Macro-Enabled Document
-            ".dotx": 14,  # Word Template (no macros)
-            ".dotm": 15,  # Word Macro-Enabled Template
-            ".pdf": 17,  # PDF File
-            ".xps": 18,  # XPS File
-        }
+        document = self.com_object
+        full_name = getattr(document, "FullName", "") if document is not None else ""
 
         # Enhanced path handling
         if not file_dir:
-            if hasattr(self.com_object, 'FullName') and self.com_object.FullName:
-                file_dir = os.path.dirname(self.com_object.FullName)
+            if full_name:
+                file_dir = os.path.dirname(full_name)
             else:
                 file_dir = self.get_safe_desktop_path()
-        else:
-            # Expand environment variables
-            file_dir = os.path.expandvars(file_dir)
-            # Expand user home directory
-            file_dir = os.path.expanduser(file_dir)
+        elif "%" in file_dir or "$" in file_dir or file_dir.startswith("~"):
+            # Expand environment variables and the user home directory
+            file_dir = os.path.expanduser(os.path.expandvars(file_dir))
             
-        print(f"DEBUG: Resolved file_dir: {file_dir}")
+        logger.debug("Resolved file_dir: %s", file_dir)
             
         if not file_name:
-            if hasattr(self.com_object, 'FullName') and self.com_object.FullName:
-                file_name = os.path.splitext(os.path.basename(self.com_object.FullName))[0]
+            if full_name:
+                file_name = os.path.splitext(os.path.basename(full_name))[0]
             else:
                 file_name = f"word_document_{int(time.time())}"
             
@@ -237,37 +338,43 @@ class WordWinCOMReceiver(WinCOMReceiverBasic):
         elif not file_ext.startswith('.'):
             file_ext = '.' + file_ext
 
-        # Validate and create directory if needed
-        try:
-            Path(file_dir).mkdir(parents=True, exist_ok=True)
-            print(f"DEBUG: Directory ensured: {file_dir}")
-        except Exception as e:
-            print(f"DEBUG: Cannot create directory {file_dir}: {e}")
-            # Fallback to user's Documents folder
-            file_dir = os.path.join(os.path.expanduser("~"), "Documents")
+        # Validate and create directory if needed, the common existing directory costs a single stat
+        if not os.path.isdir(file_dir):
             try:
                 Path(file_dir).mkdir(parents=True, exist_ok=True)
-                print(f"DEBUG: Fallback to Documents: {file_dir}")
-            except Exception:
-                # Final fallback to temp directory
-                file_dir = tempfile.gettempdir()
-                print(f"DEBUG: Final fallback to temp: {file_dir}")
-
-        # Generate unique filename if file exists
-        base_file_path = os.path.join(file_dir, file_name + file_ext)
-        file_path = base_file_path
+                logger.debug("Directory ensured: %s", file_dir)
+            except Exception as e:
+                logger.debug("Cannot create directory %s: %s", file_dir, e)
+                # Fallback to user's Documents folder
+                file_dir = _DOCS
+                try:
+                    Path(file_dir).mkdir(parents=True, exist_ok=True)
+                    logger.debug("Fallback to Documents: %s", file_dir)
+                except Exception:
+                    # Final fallback to temp directory
+                    file_dir = tempfile.gettempdir()
+                    logger.debug("Final fallback to temp: %s", file_dir)
+
+        # Generate unique filename if file exists, scanning the directory only once
+        try:
+            with os.scandir(file_dir) as entries:
+                # Windows file names are case-insensitive
+                existing = {entry.name.lower() for entry in entries}
+        except OSError:
+            existing = set()
+
+        candidate = file_name + file_ext
         counter = 1
-        
-        while os.path.exists(file_path):
-            name_with_counter = f"{file_name}_{counter}"
-            file_path = os.path.join(file_dir, name_with_counter + file_ext)
+        while candidate.lower() in existing:
+            candidate = f"{file_name}_{counter}{file_ext}"
             counter += 1
+        file_path = os.path.join(file_dir, candidate)
 
-        if file_path != base_file_path:
-            print(f"DEBUG: File exists, using unique name: {file_path}")
+        if counter > 1:
+            logger.debug("File exists, using unique name: %s", file_path)
 
         # Get file format
-        file_format = word_ext_to_fileformat.get(file_ext.lower(), 12)  # Default to docx
+        file_format = _WORD_EXT_TO_FILEFORMAT.get(file_ext.lower(), 12)  # Default to docx
 
         try:
             # Check if com_object exists
@@ -280,126 +387,111 @@ class WordWinCOMReceiver(WinCOMReceiverBasic):
         except Exception as e:
             return f"Failed to save the document to {file_path}. Error: {str(e)}"
 
+    # The save strategies in fallback order, with the label used when the saved file is missing.
+    # Each raises on failure, returns the note for the result message on success,
+    # or returns None when it does not apply to the file extension.
+    _SAVE_STRATEGIES = (
+        ("_save_by_saveas2", "SaveAs2"),
+        ("_save_by_saveas", "SaveAs"),
+        ("_save_by_saveas2_auto", "Auto-format save"),
+        ("_save_by_fixed_format", "Export"),
+        ("_save_by_copy", "Copy method"),
+    )
+
     def _attempt_save_with_fallback(self, file_path: str, file_format: int, file_ext: str) -> str:
         """
         Attempt to save with multiple fallback strategies.
         """
-        # Method 1: Standard SaveAs2 (Word 2013+)
-        try:
-            self.com_object.SaveAs2(file_path, FileFormat=file_format)
-            if os.path.exists(file_path):
-                file_size = os.path.getsize(file_path)
-                return f"Document successfully saved to {file_path} (Size: {file_size} bytes)"
-            else:
-                return f"SaveAs2 completed but file not found at {file_path}"
-        except Exception as e1:
-            print(f"DEBUG: SaveAs2 failed: {e1}")
-            
-            # Method 2: Standard SaveAs (older Word versions)
+        document = self.com_object
+
+        for name, label in self._SAVE_STRATEGIES:
             try:
-                self.com_object.SaveAs(file_path, FileFormat=file_format)
-                if os.path.exists(file_path):
-                    file_size = os.path.getsize(file_path)
-                    return f"Document successfully saved to {file_path} (Size: {file_size} bytes, legacy method)"
-                else:
-                    return f"SaveAs completed but file not found at {file_path}"
-            except Exception as e2:
-                print(f"DEBUG: Legacy SaveAs failed: {e2}")
-                
-                # Method 3: SaveAs without FileFormat parameter (let Word decide)
-                try:
-                    self.com_object.SaveAs2(file_path)
-                    if os.path.exists(file_path):
-                        return f"Document successfully saved to {file_path} (auto-format)"
-                    else:
-                        return f"Auto-format save completed but file not found"
-                except Exception as e3:
-                    print(f"DEBUG: Auto-format SaveAs failed: {e3}")
-                
-                # Method 4: Export method for PDF and XPS
-                if file_ext.lower() in ['.pdf', '.xps']:
-                    try:
-                        export_format = 17 if file_ext.lower() == '.pdf' else 18  # wdExportFormatPDF, wdExportFormatXPS
-                        self.com_object.ExportAsFixedFormat(
-                            OutputFileName=file_path,
-                            ExportFormat=export_format,
-                            OpenAfterExport=False,
-                            OptimizeFor=0,  # wdExportOptimizeForPrint
-                            BitmapMissingFonts=True,
-                            DocStructureTags=True,
-                            CreateBookmarks=0,  # wdExportDocumentContent
-                            UseISO19005_1=False
-                        )
-                        if os.path.exists(file_path):
-                            return f"Document successfully exported to {file_path}"
-                        else:
-                            return f"Export completed but file not found"
-                    except Exception as e4:
-                        print(f"DEBUG: Export method failed: {e4}")
-                
-                # Method 5: Copy and save approach
-                try:
-                    # Create a new document and copy content
-                    new_doc = self.client.Documents.Add()
-                    
-                    # Copy all content from original document
-                    self.com_object.Range().Copy()
-                    new_doc.Range().Paste()
-                    
-                    # Save the new document
-                    new_doc.SaveAs2(file_path, FileFormat=file_format)
-                    new_doc.Close()
-                    
-                    if os.path.exists(file_path):
-                        return f"Document successfully saved to {file_path} (copy method)"
-                    else:
-                        return f"Copy method completed but file not found"
-                        
-                except Exception as e5:
-                    print(f"DEBUG: Copy method failed: {e5}")
-                
-                # Final fallback: save as default Word format in Documents
-                try:
-                    fallback_path = os.path.join(
-                        os.path.expanduser("~"), "Documents", 
-                        f"UFO_Word_Export_{int(time.time())}.docx"
-                    )
-                    self.com_object.SaveAs2(fallback_path, FileFormat=12)
-                    return f"Document saved to fallback location: {fallback_path}"
-                except Exception as e6:
-                    return f"All save methods failed. Last error: {str(e6)}"
+                note = getattr(self, name)(document, file_path, file_format, file_ext)
+            except Exception as e:
+                logger.debug("%s failed: %s", name, e)
+                continue
+
+            if note is None:
+                continue
+
+            # A single stat for whichever strategy succeeded, covering both existence and size.
+            # A strategy that reported success is final, later ones could write a different file.
+            try:
+                file_size = os.stat(file_path).st_size
+            except OSError:
+                return f"{label} completed but file not found at {file_path}"
+            return f"Document successfully saved to {file_path} (Size: {file_size} bytes{note})"
+
+        # Final fallback: save as default Word format in Documents
+        try:
+            fallback_path = os.path.join(
+                _DOCS, f"UFO_Word_Export_{int(time.time())}.docx"
+            )
+            document.SaveAs2(fallback_path, FileFormat=12)
+            return f"Document saved to fallback location: {fallback_path}"
+        except Exception as e:
+            return f"All save methods failed. Last error: {str(e)}"
+
+    @staticmethod
+    def _save_by_saveas2(document, file_path: str, file_format: int, file_ext: str) -> str:
+        """
+        Standard SaveAs2 (Word 2013+).
+        """
+        document.SaveAs2(file_path, FileFormat=file_format)
+        return ""
+
+    @staticmethod
+    def _save_by_saveas(document, file_path: str, file_format: int, file_ext: str) -> str:
+        """
+        Standard SaveAs (older Word versions).
+        """
+        document.SaveAs(file_path, FileFormat=file_format)
+        return ", legacy method"
+
+    @staticmethod
+    def _save_by_saveas2_auto(document, file_path: str, file_format: int, file_ext: str) -> str:
+        """
+        SaveAs2 without FileFormat parameter (let Word decide).
+        """
+        document.SaveAs2(file_path)
+        return ", auto-format"
+
+    @staticmethod
+    def _save_by_fixed_format(document, file_path: str, file_format: int, file_ext: str) -> Optional[str]:
+        """
+        Export method for PDF and XPS.
+        """
+        file_ext = file_ext.lower()
+        if file_ext not in (".pdf", ".xps"):
+            return None
+
+        export_format = 17 if file_ext == ".pdf" else 18  # wdExportFormatPDF, wdExportFormatXPS
+        document.ExportAsFixedFormat(
+            OutputFileName=file_path,
+            ExportFormat=export_format,
+            **_WORD_FIXED_FORMAT_OPTIONS,
+        )
+        return ", export method"
+
+    def _save_by_copy(self, document, file_path: str, file_format: int, file_ext: str) -> str:
+        """
+        Copy all content into a new document and save that.
+        """
+        new_doc = self.client.Documents.Add()
+        try:
+            document.Range().Copy()
+            new_doc.Range().Paste()
+            new_doc.SaveAs2(file_path, FileFormat=file_format)
+        finally:
+            new_doc.Close(SaveChanges=0)  # wdDoNotSaveChanges
+        return ", copy method"
 
     def get_safe_desktop_path(self) -> str:
         """
         Get a safe desktop path for saving files.
+        The path is resolved once per process and reused afterwards.
         """
-        try:
-            # Try multiple methods to get desktop path
-            desktop_paths = [
-                os.path.join(os.path.expanduser("~"), "Desktop"),
-                os.path.join(os.path.expandvars("%USERPROFILE%"), "Desktop"),
-                os.path.join(os.path.expandvars("%HOMEDRIVE%"), os.path.expandvars("%HOMEPATH%"), "Desktop"),
-                os.path.join(os.path.expanduser("~"), "桌面"),  # 中文系统
-            ]
-            
-            for path in desktop_paths:
-                if os.path.exists(path) and os.access(path, os.W_OK):
-                    print(f"DEBUG: Found desktop at: {path}")
-                    return path
-            
-            # Fallback to Documents
-            docs_path = os.path.join(os.path.expanduser("~"), "Documents")
-            if os.path.exists(docs_path):
-                print(f"DEBUG: Fallback to Documents: {docs_path}")
-                return docs_path
-            
-            # Final fallback to user home
-            return os.path.expanduser("~")
-            
-        except Exception as e:
-            print(f"DEBUG: Error getting desktop path: {e}")
-            # Final fallback to temp directory
-            return tempfile.gettempdir()
+        return _resolve_desktop_path()
 
     @property
     def type_name(self):
@@ -416,6 +508,8 @@ class InsertTableCommand(WinCOMCommand):
     The command to insert a table.
     """
 
+    __slots__ = ()
+
     def execute(self):
         """
         Execute the command to insert a table.
@@ -439,6 +533,8 @@ class SelectTextCommand(WinCOMCommand):
     The command to select text.
     """
 
+    __slots__ = ()
+
     def execute(self):
         """
         Execute the command to select text.
@@ -460,6 +556,8 @@ class SelectTableCommand(WinCOMCommand):
     The command to select a table.
     """
 
+    __slots__ = ()
+
     def execute(self):
         """
         Execute the command to select a table in the document.
@@ -481,6 +579,8 @@ class SelectParagraphCommand(WinCOMCommand):
     The command to select a paragraph.
     """
 
+    __slots__ = ()
+
     def execute(self):
         """
         Execute the command to select a paragraph in the document.
@@ -506,6 +606,8 @@ class SaveAsCommand(WinCOMCommand):
     The command to save the document to a specific format.
     """
 
+    __slots__ = ()
+
     def execute(self):
         """
         Execute the command to save the document to a specific format.
@@ -521,11 +623,10 @@ class SaveAsCommand(WinCOMCommand):
         file_ext = self.params.get("file_ext", ".docx")
         
         # Handle special path cases
-        if file_dir and "%USERNAME%" in file_dir:
-            # Replace %USERNAME% with actual username
-            username = getpass.getuser()
-            file_dir = file_dir.replace("%USERNAME%", username)
-            print(f"DEBUG: Resolved %USERNAME% to: {file_dir}")
+        if file_dir and ("%" in file_dir or "$" in file_dir):
+            # Expand %USERNAME% and any other environment variables
+            file_dir = os.path.expandvars(file_dir)
+            logger.debug("Expanded environment variables to: %s", file_dir)
         
         # Ensure file extension starts with dot
         if file_ext and not file_ext.startswith('.'):
@@ -534,7 +635,7 @@ class SaveAsCommand(WinCOMCommand):
         # Use safe desktop path if specified but invalid
         if file_dir and "Desktop" in file_dir and not os.path.exists(file_dir):
             file_dir = self.receiver.get_safe_desktop_path()
-            print(f"DEBUG: Desktop fallback: {file_dir}")
+            logger.debug("Desktop fallback: %s", file_dir)
         
         try:
             result = self.receiver.save_as(
@@ -560,6 +661,8 @@ class SetFontCommand(WinCOMCommand):
     The command to set the font of the selected text.
     """
 
+    __slots__ = ()
+
     def execute(self):
         """
         Execute the command to set the font of the selected text.
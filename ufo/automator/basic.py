@@ -12,6 +12,8 @@ class ReceiverBasic(ABC):
     The abstract receiver interface.
     """
 
+    __slots__ = ()
+
     _command_registry: Dict[str, Type[CommandBasic]] = {}
 
     @property
@@ -64,6 +66,8 @@ class CommandBasic(ABC):
     The abstract command interface.
     """
 
+    __slots__ = ("receiver", "params")
+
     def __init__(self, receiver: ReceiverBasic, params: Dict = None) -> None:
         """
         Initialize the command.
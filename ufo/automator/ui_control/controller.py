@@ -123,7 +123,8 @@ class ControlReceiver(ReceiverBasic):
                             params,
                             self.control,
                             self.application,
-                            target_coords
+                            target_coords,
+                            skip_if_disabled=not handle_element_not_enabled_exception(e)
                         )
                         return smart_result
                         
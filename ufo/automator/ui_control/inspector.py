@@ -3,19 +3,27 @@
 
 from __future__ import annotations
 
+import ctypes
 import functools
+import operator
+import os
 import time
 import logging
+import weakref
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List, Optional, cast
+from concurrent.futures import ThreadPoolExecutor
+from ctypes import wintypes
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, cast
 
+import comtypes
 import comtypes.gen.UIAutomationClient as UIAutomationClient_dll
 import psutil
 import pywinauto
 import pywinauto.uia_defines
 import uiautomation as auto
-from pywinauto import Desktop
+from pywinauto.controls.hwndwrapper import HwndWrapper
 from pywinauto.controls.uiawrapper import UIAWrapper
+from pywinauto.win32_element_info import HwndElementInfo
 from pywinauto.uia_element_info import UIAElementInfo
 
 
@@ -28,6 +36,120 @@ ENHANCED_ERROR_HANDLING = configs.get("UI_ENHANCED_ERROR_HANDLING", True)
 MAX_RETRY_ATTEMPTS = configs.get("UI_MAX_RETRY_ATTEMPTS", 3)
 RETRY_DELAY_SECONDS = configs.get("UI_RETRY_DELAY_SECONDS", 0.5)
 
+# The number of threads converting desktop window handles to UIA elements
+DESKTOP_WINDOW_WORKERS = configs.get("UI_DESKTOP_WINDOW_WORKERS", 8)
+
+# Whether the elements found through the cache keep a full reference to the live element.
+# Without it, only the cached properties can be read, and no pattern or Current* call works.
+UIA_CACHE_MODE_FULL = configs.get("UI_UIA_CACHE_MODE_FULL", True)
+
+# Whether to time the UIA property lookups and report the slow ones
+PROFILE_UIA_LOOKUPS = configs.get("UI_PROFILE_UIA_LOOKUPS", False)
+
+# Reads the properties filled by FindAllBuildCache from an element in one call.
+_CACHED_ELEMENT_PROPERTIES = operator.attrgetter(
+    "CachedControlType", "CachedName", "CachedBoundingRectangle"
+)
+
+# Access right sufficient for QueryFullProcessImageNameW, granted even for most elevated processes.
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+# Window classes of the input method windows left out of the desktop windows.
+_IME_WINDOW_CLASSES = frozenset({"IME", "MSCTFIME UI"})
+
+
+@functools.lru_cache()
+def _get_user32() -> ctypes.WinDLL:
+    """
+    Load a private handle of user32 with the prototypes used to enumerate and check the
+    desktop windows, leaving the shared ctypes.windll.user32 functions untouched.
+    """
+    user32 = ctypes.WinDLL("user32")
+    user32.EnumWindowsProc = ctypes.WINFUNCTYPE(
+        wintypes.BOOL, wintypes.HWND, wintypes.LPARAM
+    )
+    user32.EnumWindows.argtypes = [user32.EnumWindowsProc, wintypes.LPARAM]
+    user32.EnumWindows.restype = wintypes.BOOL
+    user32.IsWindowVisible.argtypes = [wintypes.HWND]
+    user32.IsWindowVisible.restype = wintypes.BOOL
+    user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
+    user32.GetWindowTextLengthW.restype = ctypes.c_int
+    user32.GetClassNameW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+    user32.GetClassNameW.restype = ctypes.c_int
+    user32.IsWindow.argtypes = [wintypes.HWND]
+    user32.IsWindow.restype = wintypes.BOOL
+    return user32
+
+
+@functools.lru_cache()
+def _get_kernel32() -> ctypes.WinDLL:
+    """
+    Load a private handle of kernel32 with the prototypes used to read process image names.
+    """
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.QueryFullProcessImageNameW.argtypes = [
+        wintypes.HANDLE,
+        wintypes.DWORD,
+        wintypes.LPWSTR,
+        ctypes.POINTER(wintypes.DWORD),
+    ]
+    kernel32.QueryFullProcessImageNameW.restype = wintypes.BOOL
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    kernel32.CloseHandle.restype = wintypes.BOOL
+    return kernel32
+
+
+def _get_process_name(process_id: int) -> str:
+    """
+    Get the executable name of a process with a single QueryFullProcessImageNameW call.
+    Failures raise OSError.
+    :param process_id: The process id.
+    :return: The executable name of the process, e.g. "WINWORD.EXE".
+    """
+    kernel32 = _get_kernel32()
+    handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, process_id)
+    if not handle:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        image_name = ctypes.create_unicode_buffer(1024)
+        size = wintypes.DWORD(len(image_name))
+        if not kernel32.QueryFullProcessImageNameW(
+            handle, 0, image_name, ctypes.byref(size)
+        ):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return os.path.basename(image_name.value)
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _enum_desktop_window_handles(remove_empty: bool) -> List[int]:
+    """
+    Enumerate the visible top-level windows in a single EnumWindows pass, so no
+    pywinauto wrapper is built for the windows that are filtered out.
+    :param remove_empty: Whether to remove windows with empty titles and input method windows.
+    :return: The window handles, in z-order.
+    """
+    user32 = _get_user32()
+    class_name = ctypes.create_unicode_buffer(256)
+    handles: List[int] = []
+
+    def collect(hwnd: int, _: int) -> bool:
+        if not user32.IsWindowVisible(hwnd):
+            return True
+        if remove_empty:
+            if user32.GetWindowTextLengthW(hwnd) == 0:
+                return True
+            user32.GetClassNameW(hwnd, class_name, len(class_name))
+            if class_name.value in _IME_WINDOW_CLASSES:
+                return True
+        handles.append(hwnd)
+        return True
+
+    user32.EnumWindows(user32.EnumWindowsProc(collect), 0)
+    return handles
+
 
 class BackendFactory:
     """
@@ -91,6 +213,9 @@ class BackendStrategy(ABC):
 
 class UIAElementInfoFix(UIAElementInfo):
     _cached_rect = None
+    _runtime_id = None
+    _cached_automation_id = None
+    _cached_enabled = None
     _time_delay_marker = False
 
     def __init__(self, element, is_ref=False, source: Optional[str] = None):
@@ -110,18 +235,23 @@ class UIAElementInfoFix(UIAElementInfo):
 
     @staticmethod
     def _time_wrap(func):
+        # Without profiling, the property lookups are left undecorated
+        if not PROFILE_UIA_LOOKUPS:
+            return func
+
         def dec(self, *args, **kvargs):
             name = func.__name__
-            before = time.time()
+            before = time.perf_counter_ns()
             result = func(self, *args, **kvargs)
-            if time.time() - before > 0.020:
+            elapsed = time.perf_counter_ns() - before
+            if elapsed > 20_000_000:
                 print(
-                    f"[❌][{name}][{hash(self._element)}] lookup took {(time.time() - before) * 1000:.2f} ms"
+                    f"[❌][{name}][{hash(self._element)}] lookup took {elapsed / 1_000_000:.2f} ms"
                 )
                 UIAElementInfoFix._time_delay_marker = True
-            elif time.time() - before > 0.005:
+            elif elapsed > 5_000_000:
                 print(
-                    f"[⚠️][{name}][{hash(self._element)}]Control type lookup took {(time.time() - before) * 1000:.2f} ms"
+                    f"[⚠️][{name}][{hash(self._element)}]Control type lookup took {elapsed / 1_000_000:.2f} ms"
                 )
                 UIAElementInfoFix._time_delay_marker = True
             else:
@@ -166,11 +296,79 @@ class UIAElementInfoFix(UIAElementInfo):
     def rectangle(self):
         return self._get_cached_rectangle()
 
+    @property
+    def automation_id(self):
+        if self._cached_automation_id is None:
+            return super().automation_id
+        return self._cached_automation_id
+
+    @property
+    def control_id(self):
+        if self._cached_automation_id is None:
+            return super().control_id
+        return self._cached_automation_id
+
+    @property
+    def enabled(self):
+        if self._cached_enabled is None:
+            return super().enabled
+        return self._cached_enabled
+
     @property
     def source(self):
         return self._source
 
 
+class _CachedUIAWrapper(UIAWrapper):
+    """
+    UIA wrapper hashed by the runtime id cached by FindAllBuildCache, which does not change
+    for the lifetime of the UI element, instead of a live runtime id lookup.
+    Instances are of a subclass that also derives from the specialized wrapper for the
+    control type (e.g. EditWrapper), the same as UIAWrapper(element_info) would pick.
+    """
+
+    __slots__ = ()
+
+    # Keep the subclasses out of pywinauto's control type to wrapper registry
+    _control_types = []
+
+    def __new__(cls, element_info: UIAElementInfo) -> "_CachedUIAWrapper":
+        wrapper_class = _CachedUIAWrapper._specialize(
+            UIAWrapper.find_wrapper(element_info)
+        )
+        return UIAWrapper._create_wrapper(wrapper_class, element_info, UIAWrapper)
+
+    def __hash__(self) -> int:
+        runtime_id = self.element_info._runtime_id
+        if runtime_id is None:
+            return object.__hash__(self)
+        return hash(runtime_id)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _CachedUIAWrapper):
+            runtime_id = self.element_info._runtime_id
+            if runtime_id is None or other.element_info._runtime_id is None:
+                return self is other
+            return runtime_id == other.element_info._runtime_id
+        return super().__eq__(other)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _specialize(wrapper_class: type) -> type:
+        """
+        Get the hashable subclass of the given wrapper class, created once per class.
+        """
+        if issubclass(wrapper_class, _CachedUIAWrapper):
+            return wrapper_class
+        if wrapper_class is UIAWrapper:
+            return _CachedUIAWrapper
+        return type(
+            wrapper_class.__name__,
+            (_CachedUIAWrapper, wrapper_class),
+            {"__slots__": (), "_control_types": []},
+        )
+
+
 class UIABackendStrategy(BackendStrategy):
     """
     The backend strategy for UIA with enhanced error handling.
@@ -178,6 +376,9 @@ class UIABackendStrategy(BackendStrategy):
     
     MAX_RETRIES = MAX_RETRY_ATTEMPTS
     RETRY_DELAY = RETRY_DELAY_SECONDS
+
+    # The wrappers created for found controls, weakly referenced by the runtime id of the UI element
+    _wrapper_cache: Dict[tuple, weakref.ref] = {}
     
     @staticmethod
     def _is_window_valid(window: UIAWrapper) -> bool:
@@ -187,9 +388,12 @@ class UIABackendStrategy(BackendStrategy):
         :return: True if window is valid, False otherwise
         """
         try:
-            # Try to access basic properties to verify window is still valid
-            window.is_enabled()
-            window.element_info.rectangle
+            # A window with a handle is checked locally with IsWindow
+            handle = window.element_info.handle
+            if handle:
+                return bool(_get_user32().IsWindow(handle))
+            # Otherwise a single live property read tells whether the element is still there
+            window.element_info._element.CurrentProcessId
             return True
         except Exception as e:
             logging.debug(f"Window validation failed: {e}")
@@ -233,22 +437,50 @@ class UIABackendStrategy(BackendStrategy):
         # UIA Com API would incur severe performance occasionally (such as a new app just started)
         # so we use Win32 to acquire the handle and then convert it to UIA interface
 
-        desktop_windows = Desktop(backend="win32").windows()
-        desktop_windows = [app for app in desktop_windows if app.is_visible()]
+        handles = _enum_desktop_window_handles(remove_empty)
+        workers = min(DESKTOP_WINDOW_WORKERS, len(handles))
+        if workers <= 1:
+            return [self._handle_to_uia_wrapper(handle) for handle in handles]
 
-        if remove_empty:
-            desktop_windows = [
-                app
-                for app in desktop_windows
-                if app.window_text() != ""
-                and app.element_info.class_name not in ["IME", "MSCTFIME UI"]
-            ]
+        # Each conversion mostly waits on UIAutomationCore, so overlap them on a thread pool
+        executor = UIABackendStrategy._get_desktop_window_executor()
+        return list(executor.map(self._handle_to_uia_wrapper, handles))
 
-        uia_desktop_windows: List[UIAWrapper] = [
-            UIAWrapper(UIAElementInfo(handle_or_elem=window.handle))
-            for window in desktop_windows
-        ]
-        return uia_desktop_windows
+    @staticmethod
+    @functools.lru_cache()
+    def _get_desktop_window_executor() -> ThreadPoolExecutor:
+        """
+        Get the thread pool converting desktop window handles, shared by all calls.
+        Its threads live for the whole process and join the COM apartment once each, in
+        _init_com_worker. The apartment is released when the thread exits, so no
+        CoUninitialize call is paired with it.
+        :return: The thread pool.
+        """
+        return ThreadPoolExecutor(
+            max_workers=DESKTOP_WINDOW_WORKERS,
+            initializer=UIABackendStrategy._init_com_worker,
+            thread_name_prefix="ufo_uia_desktop",
+        )
+
+    @staticmethod
+    def _handle_to_uia_wrapper(handle: int) -> UIAWrapper:
+        """
+        Convert a window handle to a UIA wrapper.
+        :param handle: The window handle.
+        :return: The UIA wrapper of the window.
+        """
+        return UIAWrapper(UIAElementInfo(handle_or_elem=handle))
+
+    @staticmethod
+    def _init_com_worker() -> None:
+        """
+        Initialize COM for a worker thread, which joins the multithreaded apartment.
+        The workers call UIAElementInfo, which goes through pywinauto's shared IUIA() singleton,
+        whichever thread first created it. CUIAutomation and the elements it returns are
+        free-threaded (UIAutomationCore aggregates the free-threaded marshaler), so their
+        interface pointers can be called directly from the pool's apartment.
+        """
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
 
     def find_control_elements_in_descendants(
         self,
@@ -275,18 +507,21 @@ class UIABackendStrategy(BackendStrategy):
             class_name_list is None or len(class_name_list) == 0
         ), "class_name_list is not supported for UIA backend"
 
+        # Only the FindAllBuildCache call is retried, the elements are processed once it succeeds
         for retry_count in range(self.MAX_RETRIES):
             try:
-                return self._find_controls_with_cache(
+                com_elem_array = self._find_elements_with_cache(
                     window, control_type_list, is_visible, is_enabled
                 )
+                break
                 
             except Exception as error:
                 # Handle COM errors specifically
                 if hasattr(error, 'hresult'):
                     error_msg = self._handle_com_error(error, window, retry_count)
                     if error_msg is None:  # Should retry
-                        time.sleep(self.RETRY_DELAY * (retry_count + 1))  # Exponential backoff
+                        # Exponential backoff, bounded to keep the total wait small
+                        time.sleep(min(self.RETRY_DELAY * 2 ** retry_count, 2.0))
                         
                         # Re-validate window before retry
                         if not self._is_window_valid(window):
@@ -305,18 +540,25 @@ class UIABackendStrategy(BackendStrategy):
                     else:
                         logging.error(f"Final error after retries: {str(error)}")
                         return []
-        
-        return []
+        else:
+            return []
+
+        if com_elem_array is None:
+            return []
 
-    def _find_controls_with_cache(
+        # Process elements with per-element error handling, failures here skip the element
+        return list(self._process_cached_elements(com_elem_array))
+
+    def _find_elements_with_cache(
         self,
         window: UIAWrapper,
         control_type_list: List[str],
         is_visible: bool,
         is_enabled: bool
-    ) -> List[UIAWrapper]:
+    ):
         """
-        Core method to find controls using cache with proper error handling.
+        Core method to find the control elements with their properties cached.
+        :return: The found element array, or None if the search returned nothing.
         """
         _, iuia_dll = UIABackendStrategy._get_uia_defs()
         window_elem_info = cast(UIAElementInfo, window.element_info)
@@ -328,6 +570,8 @@ class UIABackendStrategy(BackendStrategy):
         if window_elem_com_ref is None:
             raise ValueError("Window COM reference is None")
 
+        # With a non-empty control_type_list the condition drops the IsControlElement check,
+        # relying on the requested types being control-view types
         condition = UIABackendStrategy._get_control_filter_condition(
             control_type_list,
             is_visible,
@@ -345,89 +589,70 @@ class UIABackendStrategy(BackendStrategy):
 
         if com_elem_array is None:
             logging.warning("FindAllBuildCache returned None")
-            return []
 
-        # Process elements with additional error handling
-        return self._process_cached_elements(com_elem_array)
+        return com_elem_array
 
-    def _process_cached_elements(self, com_elem_array) -> List[UIAWrapper]:
+    def _process_cached_elements(self, com_elem_array) -> Iterator[UIAWrapper]:
         """
         Process cached elements with individual error handling.
+        The wrappers are created lazily, so a consumer that stops early skips the rest.
         """
-        control_elements: List[UIAWrapper] = []
-        
         try:
             array_length = min(com_elem_array.Length, 500)
         except Exception as e:
             logging.error(f"Failed to get array length: {e}")
-            return []
+            return
+
+        # Bind the COM method and the cached property getter once for the whole loop
+        get_element = com_elem_array.GetElement
+        get_cached_properties = _CACHED_ELEMENT_PROPERTIES
 
         for n in range(array_length):
+            # Fetch the element and its cached properties with error handling
             try:
-                elem = com_elem_array.GetElement(n)
+                elem = get_element(n)
                 if elem is None:
                     continue
-                    
-                # Extract cached properties with error handling
-                try:
-                    elem_type = elem.CachedControlType
-                    elem_name = elem.CachedName
-                    elem_rect = elem.CachedBoundingRectangle
-                except Exception as e:
-                    logging.debug(f"Failed to get cached properties for element {n}: {e}")
-                    continue
-
-                # Skip controls with invalid/zero rectangles
-                if (elem_rect.right - elem_rect.left <= 0 or 
-                    elem_rect.bottom - elem_rect.top <= 0):
-                    continue
-                    
-                # Create UI element with error handling
-                try:
-                    uia_wrapper = self._create_uia_wrapper(elem, elem_type, elem_name, elem_rect)
-                    if uia_wrapper:
-                        control_elements.append(uia_wrapper)
-                except Exception as e:
-                    logging.debug(f"Failed to create wrapper for element {n}: {e}")
-                    continue
-                    
+                elem_type, elem_name, elem_rect = get_cached_properties(elem)
             except Exception as e:
-                logging.debug(f"Error processing element {n}: {e}")
+                logging.debug(f"Failed to get cached properties for element {n}: {e}")
+                continue
+
+            # Skip controls with invalid/zero rectangles
+            if (elem_rect.right - elem_rect.left <= 0 or 
+                elem_rect.bottom - elem_rect.top <= 0):
                 continue
 
-        return control_elements
+            # _create_uia_wrapper handles its own errors and returns None on failure
+            uia_wrapper = self._create_uia_wrapper(elem, elem_type, elem_name, elem_rect)
+            if uia_wrapper:
+                yield uia_wrapper
 
     def _create_uia_wrapper(self, elem, elem_type, elem_name, elem_rect) -> Optional[UIAWrapper]:
         """
         Create UIA wrapper with proper error handling.
+        A wrapper still alive for the same UI element (same runtime id) is returned as is only when
+        all its cached properties are unchanged. Wrappers already handed out are never modified,
+        otherwise a new wrapper is built.
         """
         try:
-            element_info = UIAElementInfoFix(elem, True, source="uia")
-            elem_type_name = UIABackendStrategy._get_uia_control_name_map().get(
-                elem_type, ""
-            )
-
-            # Set cached properties
-            element_info._cached_handle = 0
-            element_info._cached_visible = True
+            key = UIABackendStrategy._get_cached_runtime_id(elem)
+            if key is not None:
+                wrapper_ref = UIABackendStrategy._wrapper_cache.get(key)
+                uia_interface = wrapper_ref() if wrapper_ref is not None else None
+                if uia_interface is not None and UIABackendStrategy._is_element_unchanged(
+                    uia_interface.element_info, elem, elem_type, elem_name, elem_rect
+                ):
+                    return uia_interface
 
-            # Fill rectangle
-            rect = pywinauto.win32structures.RECT()
-            rect.left = elem_rect.left
-            rect.top = elem_rect.top
-            rect.right = elem_rect.right
-            rect.bottom = elem_rect.bottom
-            element_info._cached_rect = rect
-            element_info._cached_name = elem_name
-            element_info._cached_control_type = elem_type_name
-            element_info._cached_rich_text = elem_name
-
-            uia_interface = UIAWrapper(element_info)
+            element_info = UIAElementInfoFix(elem, True, source="uia")
+            element_info._runtime_id = key
+            self._fill_element_info(element_info, elem, elem_type, elem_name, elem_rect)
 
-            def __hash__(self):
-                return hash(self.element_info._element)
+            uia_interface = _CachedUIAWrapper(element_info)
 
-            uia_interface.__hash__ = __hash__
+            if key is not None:
+                UIABackendStrategy._remember_wrapper(key, uia_interface)
             return uia_interface
             
         except Exception as e:
@@ -435,11 +660,88 @@ class UIABackendStrategy(BackendStrategy):
             return None
 
     @staticmethod
+    def _is_element_unchanged(
+        element_info: UIAElementInfoFix, elem, elem_type, elem_name, elem_rect
+    ) -> bool:
+        """
+        Check whether the properties cached by FindAllBuildCache still match those of an existing wrapper.
+        A recycled runtime id pointing to another control fails the check.
+        """
+        rect = element_info._cached_rect
+        return (
+            element_info._cached_control_type
+            == UIABackendStrategy._get_uia_control_name_map().get(elem_type, "")
+            and element_info._cached_name == elem_name
+            and (rect.left, rect.top, rect.right, rect.bottom)
+            == (elem_rect.left, elem_rect.top, elem_rect.right, elem_rect.bottom)
+            and element_info._cached_class_name == elem.CachedClassName
+            and element_info._cached_automation_id == elem.CachedAutomationId
+            and element_info._cached_enabled == bool(elem.CachedIsEnabled)
+        )
+
+    @staticmethod
+    def _fill_element_info(
+        element_info: UIAElementInfoFix, elem, elem_type, elem_name, elem_rect
+    ) -> None:
+        """
+        Fill the element info with the properties cached by FindAllBuildCache.
+        """
+        elem_type_name = UIABackendStrategy._get_uia_control_name_map().get(
+            elem_type, ""
+        )
+
+        # Set cached properties
+        element_info._cached_handle = 0
+        element_info._cached_visible = True
+
+        # Fill rectangle
+        rect = pywinauto.win32structures.RECT()
+        rect.left = elem_rect.left
+        rect.top = elem_rect.top
+        rect.right = elem_rect.right
+        rect.bottom = elem_rect.bottom
+        element_info._cached_rect = rect
+        element_info._cached_name = elem_name
+        element_info._cached_control_type = elem_type_name
+        element_info._cached_rich_text = elem_name
+
+        # Read from the cache built by FindAllBuildCache, no cross-process call needed
+        element_info._cached_class_name = elem.CachedClassName
+        element_info._cached_automation_id = elem.CachedAutomationId
+        element_info._cached_enabled = bool(elem.CachedIsEnabled)
+
+    @staticmethod
+    def _get_cached_runtime_id(elem) -> Optional[tuple]:
+        """
+        Get the cached runtime id of the element, which identifies the UI element across element proxies.
+        :return: The runtime id, or None if it is not available.
+        """
+        try:
+            _, iuia_dll = UIABackendStrategy._get_uia_defs()
+            runtime_id = elem.GetCachedPropertyValue(iuia_dll.UIA_RuntimeIdPropertyId)
+            return tuple(runtime_id) if runtime_id else None
+        except Exception:
+            return None
+
+    @staticmethod
+    def _remember_wrapper(key: tuple, uia_interface: UIAWrapper) -> None:
+        """
+        Remember the wrapper by runtime id without keeping it alive, and prune dead entries from time to time.
+        """
+        cache = UIABackendStrategy._wrapper_cache
+        cache[key] = weakref.ref(uia_interface)
+        if len(cache) % 1024 == 0:
+            for dead_key in [k for k, ref in cache.items() if ref() is None]:
+                del cache[dead_key]
+
+    @staticmethod
+    @functools.lru_cache()
     def _get_uia_control_id_map():
         iuia = pywinauto.uia_defines.IUIA()
         return iuia.known_control_types
 
     @staticmethod
+    @functools.lru_cache()
     def _get_uia_control_name_map():
         iuia = pywinauto.uia_defines.IUIA()
         return iuia.known_control_type_ids
@@ -452,6 +754,15 @@ class UIABackendStrategy(BackendStrategy):
         cache_request.AddProperty(iuia_dll.UIA_ControlTypePropertyId)
         cache_request.AddProperty(iuia_dll.UIA_NamePropertyId)
         cache_request.AddProperty(iuia_dll.UIA_BoundingRectanglePropertyId)
+        # The properties get_control_info and the wrappers read afterwards
+        cache_request.AddProperty(iuia_dll.UIA_AutomationIdPropertyId)
+        cache_request.AddProperty(iuia_dll.UIA_ClassNamePropertyId)
+        cache_request.AddProperty(iuia_dll.UIA_IsEnabledPropertyId)
+        # Identifies the UI element, to reuse its wrapper across searches
+        cache_request.AddProperty(iuia_dll.UIA_RuntimeIdPropertyId)
+        if not UIA_CACHE_MODE_FULL:
+            # Skip marshaling the element references when only the cached properties are read
+            cache_request.AutomationElementMode = iuia_dll.AutomationElementMode_None
         return cache_request
 
     @staticmethod
@@ -459,41 +770,63 @@ class UIABackendStrategy(BackendStrategy):
         control_type_list: List[str] = [],
         is_visible: bool = True,
         is_enabled: bool = True,
+    ):
+        # The condition only depends on the arguments, so identical filters share one COM condition.
+        # The OR of control types ignores order and duplicates, so the key is normalized on both.
+        return UIABackendStrategy._build_control_filter_condition(
+            tuple(sorted(set(control_type_list), key=str)), is_visible, is_enabled
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _build_control_filter_condition(
+        control_types: Tuple[str, ...],
+        is_visible: bool,
+        is_enabled: bool,
     ):
         iuia_com, iuia_dll = UIABackendStrategy._get_uia_defs()
-        condition = iuia_com.CreateAndConditionFromArray(
-            [
-                iuia_com.CreatePropertyCondition(
-                    iuia_dll.UIA_IsEnabledPropertyId, is_enabled
-                ),
-                iuia_com.CreatePropertyCondition(
-                    # visibility is determined by IsOffscreen property
-                    iuia_dll.UIA_IsOffscreenPropertyId,
-                    not is_visible,
-                ),
+
+        # Resolve the control type names to ids once, before building the conditions
+        control_id_map = UIABackendStrategy._get_uia_control_id_map()
+        control_type_ids = [
+            control_type if isinstance(control_type, int) else control_id_map[control_type]
+            for control_type in control_types
+        ]
+
+        conditions = [
+            iuia_com.CreatePropertyCondition(
+                iuia_dll.UIA_IsEnabledPropertyId, is_enabled
+            ),
+            iuia_com.CreatePropertyCondition(
+                # visibility is determined by IsOffscreen property
+                iuia_dll.UIA_IsOffscreenPropertyId,
+                not is_visible,
+            ),
+        ]
+        # The control types UFO asks for are all control-view types, so the IsControlElement
+        # check is only needed when no control type narrows the search
+        if not control_type_ids:
+            conditions.append(
                 iuia_com.CreatePropertyCondition(
                     iuia_dll.UIA_IsControlElementPropertyId, True
-                ),
-                iuia_com.CreateOrConditionFromArray(
-                    [
-                        iuia_com.CreatePropertyCondition(
-                            iuia_dll.UIA_ControlTypePropertyId,
-                            (
-                                control_type
-                                if control_type is int
-                                else UIABackendStrategy._get_uia_control_id_map()[
-                                    control_type
-                                ]
-                            ),
-                        )
-                        for control_type in control_type_list
-                    ]
-                ),
-            ]
+                )
+            )
+        conditions.append(
+            iuia_com.CreateOrConditionFromArray(
+                [
+                    iuia_com.CreatePropertyCondition(
+                        iuia_dll.UIA_ControlTypePropertyId, control_type_id
+                    )
+                    for control_type_id in control_type_ids
+                ]
+            )
         )
+
+        condition = iuia_com.CreateAndConditionFromArray(conditions)
         return condition
 
     @staticmethod
+    @functools.lru_cache()
     def _get_uia_defs():
         iuia = pywinauto.uia_defines.IUIA()
         iuia_com: UIAutomationClient_dll.IUIAutomation = iuia.iuia
@@ -513,17 +846,10 @@ class Win32BackendStrategy(BackendStrategy):
         :return: The apps on the desktop.
         """
 
-        desktop_windows = Desktop(backend="win32").windows()
-        desktop_windows = [app for app in desktop_windows if app.is_visible()]
-
-        if remove_empty:
-            desktop_windows = [
-                app
-                for app in desktop_windows
-                if app.window_text() != ""
-                and app.element_info.class_name not in ["IME", "MSCTFIME UI"]
-            ]
-        return desktop_windows
+        return [
+            HwndWrapper(HwndElementInfo(handle))
+            for handle in _enum_desktop_window_handles(remove_empty)
+        ]
 
     def find_control_elements_in_descendants(
         self,
@@ -550,67 +876,88 @@ class Win32BackendStrategy(BackendStrategy):
         if window == None:
             return []
 
-        control_elements = []
-        if len(class_name_list) == 0:
-            control_elements += window.descendants()
+        # Walk the descendant tree once and filter the class names with the other fields
+        if depth == 0:
+            control_elements = window.descendants()
         else:
-            for class_name in class_name_list:
-                if depth == 0:
-                    subcontrols = window.descendants(class_name=class_name)
-                else:
-                    subcontrols = window.descendants(class_name=class_name, depth=depth)
-                control_elements += subcontrols
+            control_elements = window.descendants(depth=depth)
 
-        if is_visible:
-            control_elements = [
-                control for control in control_elements if control.is_visible()
-            ]
-        if is_enabled:
-            control_elements = [
-                control for control in control_elements if control.is_enabled()
-            ]
-        if len(title_list) > 0:
-            control_elements = [
-                control
-                for control in control_elements
-                if control.window_text() in title_list
-            ]
-        if len(control_type_list) > 0:
-            control_elements = [
-                control
-                for control in control_elements
-                if control.element_info.control_type in control_type_list
-            ]
+        # Apply all filters in one pass, cheap checks first so the window queries run on fewer controls
+        class_name_set = set(class_name_list)
+        title_set = set(title_list)
+        control_type_set = set(control_type_list)
 
         return [
-            control for control in control_elements if control.element_info.name != ""
+            control
+            for control in control_elements
+            if (not class_name_set or control.element_info.class_name in class_name_set)
+            and (not control_type_set or control.element_info.control_type in control_type_set)
+            and (not title_set or control.window_text() in title_set)
+            and control.element_info.name != ""
+            and (not is_visible or control.is_visible())
+            and (not is_enabled or control.is_enabled())
         ]
 
 
+def _control_rect(element_info: UIAElementInfo) -> Tuple[int, int, int, int]:
+    """
+    Get the rectangle of the element as a (left, top, right, bottom) tuple.
+    """
+    rectangle = element_info.rectangle
+    return (rectangle.left, rectangle.top, rectangle.right, rectangle.bottom)
+
+
+def _control_source(window: UIAWrapper) -> str:
+    """
+    Get the source of the element, or an empty string if it has none.
+    """
+    try:
+        return window.element_info.source
+    except:
+        return ""
+
+
+# The fields of ControlInspectorFacade.get_control_info, in output order.
+# Each getter takes the window and its (cached) element info.
+_CONTROL_INFO_FIELDS: Dict[str, Callable[[UIAWrapper, UIAElementInfo], object]] = {
+    "control_type": lambda window, info: info.control_type,
+    "control_id": lambda window, info: info.control_id,
+    "control_class": lambda window, info: info.class_name,
+    "control_name": lambda window, info: info.name,
+    "control_rect": lambda window, info: _control_rect(info),
+    "control_text": lambda window, info: info.name,
+    "control_title": lambda window, info: window.window_text(),
+    "selected": lambda window, info: ControlInspectorFacade.get_check_state(window),
+    "source": lambda window, info: _control_source(window),
+}
+
+
 class ControlInspectorFacade:
     """
     The singleton facade class for control inspector.
     """
 
-    _instances = {}
-
     def __new__(cls, backend: str = "uia") -> "ControlInspectorFacade":
         """
-        Singleton pattern.
+        Singleton pattern. The facade of each backend is created once, at import.
         """
-        if backend not in cls._instances:
-            instance = super().__new__(cls)
-            instance.backend = backend
-            instance.backend_strategy = BackendFactory.create_backend(backend)
-            cls._instances[backend] = instance
-        return cls._instances[backend]
+        if backend == "uia":
+            return _UIA_FACADE
+        if backend == "win32":
+            return _WIN32_FACADE
+        raise ValueError(f"Backend {backend} not supported")
 
-    def __init__(self, backend: str = "uia") -> None:
+    @classmethod
+    def _create(cls, backend: str) -> "ControlInspectorFacade":
         """
-        Initialize the control inspector.
+        Create the facade of a backend.
         :param backend: The backend to use.
+        :return: The facade.
         """
-        self.backend = backend
+        instance = super().__new__(cls)
+        instance.backend = backend
+        instance.backend_strategy = BackendFactory.create_backend(backend)
+        return instance
 
     def get_desktop_windows(self, remove_empty: bool = True) -> List[UIAWrapper]:
         """
@@ -702,10 +1049,8 @@ class ControlInspectorFacade:
         :param field_list: The fields to get.
         return: The list of control info of the window.
         """
-        control_info_list = []
-        for window in window_list:
-            control_info_list.append(self.get_control_info(window, field_list))
-        return control_info_list
+        extractor = self._make_control_info_extractor(field_list)
+        return [extractor(window) for window in window_list]
 
     def get_control_info_list_of_dict(
         self, window_dict: Dict[str, UIAWrapper], field_list: List[str] = []
@@ -716,10 +1061,10 @@ class ControlInspectorFacade:
         :param field_list: The fields to get.
         return: The list of control info of the window.
         """
+        extractor = self._make_control_info_extractor(field_list)
         control_info_list = []
-        for key in window_dict.keys():
-            window = window_dict[key]
-            control_info = self.get_control_info(window, field_list)
+        for key, window in window_dict.items():
+            control_info = extractor(window)
             control_info["label"] = key
             control_info_list.append(control_info)
         return control_info_list
@@ -757,6 +1102,34 @@ class ControlInspectorFacade:
             # print(e)
             return None
 
+    @staticmethod
+    def _get_cached_element_info(window: UIAWrapper):
+        """
+        Get an element info whose properties are all read in one UIA round trip.
+        Element infos found through the UIA cache are returned as is, other UIA element infos are
+        refreshed with a single BuildUpdatedCache call instead of one call per property.
+        :param window: The window to get the element info of.
+        :return: The element info to read the control properties from.
+        """
+        element_info = window.element_info
+        if isinstance(element_info, UIAElementInfoFix) or not isinstance(
+            element_info, UIAElementInfo
+        ):
+            return element_info
+
+        try:
+            cached_elem = element_info._element.BuildUpdatedCache(
+                UIABackendStrategy._get_cache_request()
+            )
+            cached_info = UIAElementInfoFix(cached_elem, True, source="uia")
+            UIABackendStrategy._fill_element_info(
+                cached_info, cached_elem, *_CACHED_ELEMENT_PROPERTIES(cached_elem)
+            )
+            return cached_info
+        except Exception as e:
+            logging.debug(f"Failed to build the element cache, reading live properties: {e}")
+            return element_info
+
     @staticmethod
     def get_control_info(
         window: UIAWrapper, field_list: List[str] = []
@@ -767,41 +1140,32 @@ class ControlInspectorFacade:
         :param field_list: The fields to get.
         return: The control info of the window.
         """
-        control_info: Dict[str, str] = {}
-
-        def assign(prop_name: str, prop_value_func: Callable[[], str]) -> None:
-            if len(field_list) > 0 and prop_name not in field_list:
-                return
-            control_info[prop_name] = prop_value_func()
+        return ControlInspectorFacade._make_control_info_extractor(field_list)(window)
 
-        try:
-            assign("control_type", lambda: window.element_info.control_type)
-            assign("control_id", lambda: window.element_info.control_id)
-            assign("control_class", lambda: window.element_info.class_name)
-            assign("control_name", lambda: window.element_info.name)
-            rectangle = window.element_info.rectangle
-            assign(
-                "control_rect",
-                lambda: (
-                    rectangle.left,
-                    rectangle.top,
-                    rectangle.right,
-                    rectangle.bottom,
-                ),
-            )
-            assign("control_text", lambda: window.element_info.name)
-            assign("control_title", lambda: window.window_text())
-            assign("selected", lambda: ControlInspectorFacade.get_check_state(window))
+    @staticmethod
+    def _make_control_info_extractor(
+        field_list: List[str] = [],
+    ) -> Callable[[UIAWrapper], Dict[str, str]]:
+        """
+        Build a control info extractor for the given fields, so the field selection
+        is resolved once instead of once per field for every window.
+        :param field_list: The fields to get. All fields if empty.
+        return: A function mapping a window to its control info.
+        """
+        fields = tuple(
+            (name, getter)
+            for name, getter in _CONTROL_INFO_FIELDS.items()
+            if not field_list or name in field_list
+        )
 
+        def extract(window: UIAWrapper) -> Dict[str, str]:
             try:
-                source = window.element_info.source
-                assign("source", lambda: source)
+                element_info = ControlInspectorFacade._get_cached_element_info(window)
+                return {name: getter(window, element_info) for name, getter in fields}
             except:
-                assign("source", lambda: "")
+                return {}
 
-            return control_info
-        except:
-            return {}
+        return extract
 
     @staticmethod
     def get_application_root_name(window: UIAWrapper) -> str:
@@ -813,6 +1177,10 @@ class ControlInspectorFacade:
         if window == None:
             return ""
         process_id = window.process_id()
+        try:
+            return _get_process_name(process_id)
+        except OSError:
+            pass
         try:
             process = psutil.Process(process_id)
             return process.name()
@@ -861,25 +1229,41 @@ class ControlInspectorFacade:
         except Exception as e:
             logging.error(f"Error finding control elements: {str(e)}")
             # Try fallback strategy
-            return self._fallback_control_search(window, control_type_list)
+            return self._fallback_control_search(window, control_type_list, depth)
     
-    def _fallback_control_search(self, window: UIAWrapper, control_type_list: List[str]) -> List[UIAWrapper]:
+    def _fallback_control_search(
+        self, window: UIAWrapper, control_type_list: List[str], depth: int = 0
+    ) -> List[UIAWrapper]:
         """
         Fallback control search using simpler methods.
         """
         try:
             logging.info("Attempting fallback control search")
+
+            # Let UIA filter the control types natively, so only the matches are marshaled
+            if control_type_list and isinstance(window.element_info, UIAElementInfo):
+                try:
+                    return self._find_all_by_control_type(window, control_type_list, 100)
+                except Exception as e:
+                    logging.warning(f"Native fallback control search failed: {str(e)}")
             
             # Try to use basic descendants method without cache
             if hasattr(window, 'descendants'):
-                descendants = window.descendants()
-                # Filter by control type if specified
-                if control_type_list:
-                    descendants = [
-                        d for d in descendants 
-                        if hasattr(d.element_info, 'control_type') and 
-                        d.element_info.control_type in control_type_list
-                    ]
+                # Walk the top levels first, and only widen to the requested depth when they
+                # hold no match
+                shallow_depth = 3
+                if depth == 0 or depth > shallow_depth:
+                    descendants = self._filter_by_control_type(
+                        window.descendants(depth=shallow_depth), control_type_list
+                    )
+                    if descendants:
+                        return descendants[:100]
+
+                if depth == 0:
+                    descendants = window.descendants()
+                else:
+                    descendants = window.descendants(depth=depth)
+                descendants = self._filter_by_control_type(descendants, control_type_list)
                 return descendants[:100]  # Limit to prevent performance issues
                 
         except Exception as e:
@@ -887,6 +1271,53 @@ class ControlInspectorFacade:
             
         return []
     
+    @staticmethod
+    def _filter_by_control_type(
+        controls: List[UIAWrapper], control_type_list: List[str]
+    ) -> List[UIAWrapper]:
+        """
+        Keep the controls of the given control types, or all of them if none is given.
+        """
+        if not control_type_list:
+            return controls
+        return [
+            d for d in controls 
+            if hasattr(d.element_info, 'control_type') and 
+            d.element_info.control_type in control_type_list
+        ]
+
+    @staticmethod
+    def _find_all_by_control_type(
+        window: UIAWrapper, control_type_list: List[str], limit: int
+    ) -> List[UIAWrapper]:
+        """
+        Find the descendants of the given control types with a single UIA FindAll call.
+        :param window: The window to search in.
+        :param control_type_list: The control types to find.
+        :param limit: The maximum number of controls to return.
+        :return: The control elements found.
+        """
+        iuia_com, iuia_dll = UIABackendStrategy._get_uia_defs()
+        control_id_map = UIABackendStrategy._get_uia_control_id_map()
+        condition = iuia_com.CreateOrConditionFromArray(
+            [
+                iuia_com.CreatePropertyCondition(
+                    iuia_dll.UIA_ControlTypePropertyId,
+                    control_type if isinstance(control_type, int) else control_id_map[control_type],
+                )
+                for control_type in control_type_list
+            ]
+        )
+        com_elem_array = window.element_info._element.FindAll(
+            iuia_dll.TreeScope_Descendants, condition
+        )
+        if com_elem_array is None:
+            return []
+        return [
+            UIAWrapper(UIAElementInfo(com_elem_array.GetElement(n)))
+            for n in range(min(com_elem_array.Length, limit))
+        ]
+
     def safe_get_desktop_app_dict(self, remove_empty: bool = True) -> Dict[str, UIAWrapper]:
         """
         Safely get desktop app dict with error handling.
@@ -897,3 +1328,7 @@ class ControlInspectorFacade:
             logging.error(f"Error getting desktop apps: {str(e)}")
             # Return minimal safe dict
             return {}
+
+
+_UIA_FACADE = ControlInspectorFacade._create("uia")
+_WIN32_FACADE = ControlInspectorFacade._create("win32")
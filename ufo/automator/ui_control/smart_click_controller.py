@@ -1,13 +1,22 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
+import functools
+import random
+import re
+import sys
+import threading
 import time
 import warnings
 from typing import Any, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 
+import comtypes
 import pyautogui
 import pywinauto
+import pywinauto.uia_defines
+from pywinauto import Desktop
+import comtypes.gen.UIAutomationClient as UIAutomationClient_dll
 from pywinauto.controls.uiawrapper import UIAWrapper
 from pywinauto.win32structures import RECT
 
@@ -16,13 +25,16 @@ from ufo.utils import print_with_color
 
 configs = Config.get_instance().config_data
 
+# dataclass 在 Python 3.10+ 才支持 slots 参数，3.9 下退回普通 dataclass
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class ClickAttempt:
     """记录单次点击尝试的信息"""
     x: int
     y: int
-    timestamp: float
+    timestamp: int  # time.perf_counter_ns()，单调时钟，只用于比较先后和间隔
     success: bool = False
     error_message: str = ""
 
@@ -42,9 +54,33 @@ class SmartClickConfig:
         (-1, 0),   # 左
         (-1, -1),  # 左上
     ])
-    wait_between_clicks: float = 0.2  # 点击间隔时间
+    wait_between_clicks: float = 0.2  # 重试退避等待的上限
+    retry_base: float = 0.025  # 重试退避的初始等待时间
+    retry_cap: float = 0.4  # 重试退避等待时间上限
+    retry_jitter: float = 0.05  # 重试等待的随机抖动上限
     focus_change_timeout: float = 1.0  # 焦点变化检测超时时间
-    element_stability_check_count: int = 3  # 连续失败检查次数
+    element_stability_check_count: int = 3  # 已不再使用：每次重试前都会检查元素稳定性，保留以兼容旧配置
+
+    def __post_init__(self):
+        # 预先展开为 (距离, x偏移, y偏移) 表，按距离层级排列，重试时直接遍历
+        self.offset_table: Tuple[Tuple[int, int, int], ...] = tuple(
+            (distance, direction_x * distance, direction_y * distance)
+            for distance in self.retry_offsets
+            for direction_x, direction_y in self.retry_directions
+        )
+
+
+class _FocusChangedEventHandler(comtypes.COMObject):
+    """UIA焦点变化事件处理器，在UIA的事件线程上被调用"""
+
+    _com_interfaces_ = [UIAutomationClient_dll.IUIAutomationFocusChangedEventHandler]
+
+    def __init__(self, focus_event: threading.Event):
+        super().__init__()
+        self._focus_event = focus_event
+
+    def HandleFocusChangedEvent(self, sender) -> None:
+        self._focus_event.set()
 
 
 class FocusChangeDetector:
@@ -53,20 +89,67 @@ class FocusChangeDetector:
     def __init__(self):
         self.initial_window_handle = None
         self.initial_focus_element = None
+        self.application_window: Optional[UIAWrapper] = None
+        # 轮询焦点时复用同一个Desktop对象
+        self._desktop = Desktop(backend="uia")
+        # 由UIA焦点变化事件置位，等待时无需任何COM调用
+        self._focus_event = threading.Event()
+        self._focus_handler: Optional[_FocusChangedEventHandler] = None
     
     def capture_initial_state(self, application_window: UIAWrapper) -> None:
         """捕获初始焦点状态"""
+        self.application_window = application_window
+        self._register_focus_handler()
+        self._focus_event.clear()
+        if self._focus_handler is not None:
+            # 事件订阅已生效，不再需要查询初始焦点
+            return
         try:
             self.initial_window_handle = application_window.handle
             # 尝试获取当前焦点元素
             try:
-                from pywinauto import Desktop
-                desktop = Desktop(backend="uia")
-                self.initial_focus_element = desktop.get_focus()
+                self.initial_focus_element = self._desktop.get_focus()
             except Exception:
                 self.initial_focus_element = None
         except Exception as e:
             print_with_color(f"Failed to capture initial focus state: {e}", "yellow")
+
+    def _register_focus_handler(self) -> None:
+        """订阅UIA焦点变化事件，在close()中取消订阅"""
+        if self._focus_handler is not None:
+            return
+        try:
+            handler = _FocusChangedEventHandler(self._focus_event)
+            pywinauto.uia_defines.IUIA().iuia.AddFocusChangedEventHandler(None, handler)
+            self._focus_handler = handler
+        except Exception as e:
+            print_with_color(f"Failed to subscribe to focus change events, polling instead: {e}", "yellow")
+
+    def wait_for_focus_change(self, timeout: float) -> bool:
+        """等待焦点变化，超时返回False"""
+        if self._focus_handler is None:
+            # 事件订阅失败时退回到轮询
+            timeout_ns = int(timeout * 1e9)
+            start_time = time.perf_counter_ns()
+            while time.perf_counter_ns() - start_time < timeout_ns:
+                if self.has_focus_changed(self.application_window):
+                    return True
+                time.sleep(0.05)
+            return False
+
+        changed = self._focus_event.wait(timeout)
+        self._focus_event.clear()
+        return changed
+
+    def close(self) -> None:
+        """取消UIA焦点变化事件订阅"""
+        handler, self._focus_handler = self._focus_handler, None
+        if handler is None:
+            return
+        try:
+            pywinauto.uia_defines.IUIA().iuia.RemoveFocusChangedEventHandler(handler)
+        except Exception:
+            pass
     
     def has_focus_changed(self, application_window: UIAWrapper) -> bool:
         """检测焦点是否发生变化"""
@@ -78,9 +161,7 @@ class FocusChangeDetector:
             
             # 检查焦点元素是否变化
             try:
-                from pywinauto import Desktop
-                desktop = Desktop(backend="uia")
-                current_focus = desktop.get_focus()
+                current_focus = self._desktop.get_focus()
                 
                 if self.initial_focus_element is None and current_focus is not None:
                     return True
@@ -100,35 +181,56 @@ class FocusChangeDetector:
             return False
 
 
+@functools.lru_cache()
+def _get_snapshot_cache_request():
+    """创建点击开始时读取控件矩形和启用状态所用的UIA CacheRequest"""
+    iuia = pywinauto.uia_defines.IUIA()
+    cache_request = iuia.iuia.CreateCacheRequest()
+    cache_request.AddProperty(iuia.UIA_dll.UIA_BoundingRectanglePropertyId)
+    cache_request.AddProperty(iuia.UIA_dll.UIA_IsEnabledPropertyId)
+    return cache_request
+
+
 class ElementStabilityChecker:
     """UI元素稳定性检查器"""
     
-    def __init__(self, control: UIAWrapper):
+    def __init__(self, control: UIAWrapper, cached_element=None):
+        """
+        :param control: 目标控件
+        :param cached_element: 已缓存BoundingRectangle的UIA元素，提供时直接取其矩形作为初始矩形
+        """
         self.control = control
-        self.original_rect = None
+        self.original_rect: Optional[Tuple[int, int, int, int]] = None
         if control:
             try:
-                self.original_rect = control.rectangle()
+                if cached_element is not None:
+                    rect = cached_element.CachedBoundingRectangle
+                    self.original_rect = (rect.left, rect.top, rect.right, rect.bottom)
+                else:
+                    self.original_rect = self._read_rect()
             except Exception:
                 self.original_rect = None
+
+    def _read_rect(self) -> Tuple[int, int, int, int]:
+        """
+        读取控件当前的矩形 (left, top, right, bottom)。UIA元素直接读取CurrentBoundingRectangle，
+        只需一次COM调用，且不会拿到inspector缓存在element_info中的旧矩形。
+        """
+        element = getattr(self.control.element_info, "_element", None)
+        if element is None:
+            rect = self.control.rectangle()
+        else:
+            rect = element.CurrentBoundingRectangle
+        return (rect.left, rect.top, rect.right, rect.bottom)
     
     def is_element_stable(self) -> bool:
         """检查元素是否仍然稳定（在UI树中且矩形位置未变）"""
-        if not self.control or not self.original_rect:
+        if not self.control or self.original_rect is None:
             return False
         
         try:
-            # 检查元素是否仍然可访问
-            current_rect = self.control.rectangle()
-            
-            # 检查矩形是否相同
-            if (current_rect.left == self.original_rect.left and
-                current_rect.top == self.original_rect.top and
-                current_rect.right == self.original_rect.right and
-                current_rect.bottom == self.original_rect.bottom):
-                return True
-            
-            return False
+            # 检查元素是否仍然可访问，且矩形是否相同
+            return self._read_rect() == self.original_rect
         except Exception:
             # 如果无法访问元素，说明元素已不稳定
             return False
@@ -142,6 +244,7 @@ class SmartClickController:
         self.click_attempts: List[ClickAttempt] = []
         self.focus_detector = FocusChangeDetector()
         self.element_checker: Optional[ElementStabilityChecker] = None
+        self._log_buffer: List[str] = []
     
     def smart_click_with_retry(
         self,
@@ -149,7 +252,8 @@ class SmartClickController:
         params: Dict[str, Any],
         control: Optional[UIAWrapper],
         application_window: UIAWrapper,
-        target_coordinates: Optional[Tuple[int, int]] = None
+        target_coordinates: Optional[Tuple[int, int]] = None,
+        skip_if_disabled: bool = False
     ) -> str:
         """
         执行智能点击重试
@@ -159,48 +263,114 @@ class SmartClickController:
         :param control: 目标控件
         :param application_window: 应用程序窗口
         :param target_coordinates: 目标坐标 (绝对坐标)
+        :param skip_if_disabled: 首次点击失败后控件被禁用时不进入网格重试。
+            仅用于非ElementNotEnabled的连续失败，ElementNotEnabled本身就意味着控件报告为禁用
         :return: 点击结果
         """
+        # 过程日志先缓存，整个重试结束后一次输出
+        self._log_buffer.clear()
+        try:
+            # 焦点变化事件只在本次重试期间订阅，结束后立即取消
+            return self._run_smart_click(
+                original_click_func,
+                params,
+                control,
+                application_window,
+                target_coordinates,
+                skip_if_disabled,
+            )
+        finally:
+            self.focus_detector.close()
+            self._flush_log()
+
+    def _run_smart_click(
+        self,
+        original_click_func,
+        params: Dict[str, Any],
+        control: Optional[UIAWrapper],
+        application_window: UIAWrapper,
+        target_coordinates: Optional[Tuple[int, int]],
+        skip_if_disabled: bool
+    ) -> str:
+        """执行智能点击重试的具体流程，参数同smart_click_with_retry"""
         # 重置状态
         self.click_attempts.clear()
         self.focus_detector.capture_initial_state(application_window)
-        self.element_checker = ElementStabilityChecker(control) if control else None
+        # 一次COM调用读取控件的初始矩形和启用状态
+        cached_element = self._build_cached_element(control)
+        self.element_checker = (
+            ElementStabilityChecker(control, cached_element) if control else None
+        )
         
-        print_with_color("Starting smart click with retry mechanism...", "cyan")
+        self._log_buffer.append("Starting smart click with retry mechanism...")
         
         # 首次尝试原始点击
         result = self._attempt_click(original_click_func, params, 0, 0)
         if result["success"]:
-            print_with_color("Original click succeeded", "green")
+            self._log_buffer.append("Original click succeeded")
             return result["message"]
         
+        # 非ElementNotEnabled的连续失败时，被禁用的控件点哪里都不会成功，不进入网格重试
+        if skip_if_disabled and is_control_disabled(control, cached_element):
+            self._log_buffer.append("Control is disabled, skipping smart click retry")
+            return "Click failed: control is disabled"
+
+        # 窗口矩形只查询一次，整个重试过程复用
+        app_rect = self._get_app_rect(application_window)
+
         # 如果原始点击失败，开始网格重试
         if not target_coordinates:
             # 尝试从参数中提取坐标
-            target_coordinates = self._extract_coordinates_from_params(params, application_window)
+            target_coordinates = self._extract_coordinates_from_params(params, app_rect)
         
         if not target_coordinates:
-            print_with_color("Cannot extract target coordinates for retry", "red")
+            self._log_buffer.append("Cannot extract target coordinates for retry")
             return result["message"]
         
         return self._perform_grid_retry(
-            original_click_func, params, target_coordinates, application_window
+            original_click_func, params, target_coordinates, app_rect
         )
+
+    @staticmethod
+    def _build_cached_element(control: Optional[UIAWrapper]):
+        """
+        通过一次BuildUpdatedCache取得缓存了BoundingRectangle和IsEnabled的UIA元素，
+        非UIA控件或失败时返回None
+        """
+        element = getattr(control.element_info, "_element", None) if control else None
+        if element is None:
+            return None
+        try:
+            return element.BuildUpdatedCache(_get_snapshot_cache_request())
+        except Exception:
+            return None
+
+    @staticmethod
+    def _get_app_rect(
+        application_window: Optional[UIAWrapper],
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """获取应用程序窗口的 (left, top, width, height)，失败时返回None"""
+        try:
+            rect = application_window.rectangle()
+            return (rect.left, rect.top, rect.width(), rect.height())
+        except Exception as e:
+            print_with_color(f"Failed to get application window rectangle: {e}", "yellow")
+            return None
     
     def _extract_coordinates_from_params(
-        self, params: Dict[str, Any], application_window: UIAWrapper
+        self, params: Dict[str, Any], app_rect: Optional[Tuple[int, int, int, int]]
     ) -> Optional[Tuple[int, int]]:
         """从参数中提取目标坐标"""
         try:
             # 处理相对坐标
-            if "x" in params and "y" in params:
+            if app_rect is not None and "x" in params and "y" in params:
                 x = float(params["x"])
                 y = float(params["y"])
                 
                 # 转换为绝对坐标
-                app_rect = application_window.rectangle()
-                abs_x = int(app_rect.left + x * app_rect.width())
-                abs_y = int(app_rect.top + y * app_rect.height())
+                left, top, width, height = app_rect
+                abs_x = int(left + x * width)
+                abs_y = int(top + y * height)
                 
                 return (abs_x, abs_y)
         except Exception as e:
@@ -213,86 +383,108 @@ class SmartClickController:
         original_click_func,
         params: Dict[str, Any],
         center_coords: Tuple[int, int],
-        application_window: UIAWrapper
+        app_rect: Optional[Tuple[int, int, int, int]]
     ) -> str:
         """执行网格化重试点击"""
         center_x, center_y = center_coords
-        consecutive_failures = 0
+        retry_count = 0
+        current_distance = None
+
+        # 重试参数只复制一次，每次尝试原地更新坐标
+        retry_params = params.copy()
+
+        # 绝对坐标到相对坐标的换算在整个重试过程中不变，只算一次
+        relative_transform = self._get_relative_transform(app_rect)
         
-        print_with_color(f"Starting grid retry around center ({center_x}, {center_y})", "cyan")
+        self._log_buffer.append(f"Starting grid retry around center ({center_x}, {center_y})")
         
-        # 按距离层级进行重试
-        for distance in self.config.retry_offsets:
-            print_with_color(f"Trying offset distance: ±{distance}px", "cyan")
-            
-            # 在当前距离的8个方向上尝试
-            for direction_x, direction_y in self.config.retry_directions:
-                if len(self.click_attempts) >= self.config.max_retries:
-                    break
-                
-                # 计算偏移坐标
-                offset_x = center_x + (direction_x * distance)
-                offset_y = center_y + (direction_y * distance)
-                
-                # 更新参数中的坐标
-                retry_params = self._update_params_with_coordinates(
-                    params, offset_x, offset_y, application_window
-                )
-                
-                # 尝试点击
-                result = self._attempt_click(
-                    original_click_func, retry_params, offset_x, offset_y
-                )
-                
-                if result["success"]:
-                    print_with_color(
-                        f"Smart retry succeeded at offset ({direction_x * distance}, {direction_y * distance})",
-                        "green"
-                    )
-                    return result["message"]
-                
-                consecutive_failures += 1
-                
-                # 检查连续失败和元素稳定性
-                if consecutive_failures >= self.config.element_stability_check_count:
-                    if not self._should_continue_retry():
-                        print_with_color(
-                            "Element is no longer stable, stopping retry", "yellow"
-                        )
-                        break
-                    consecutive_failures = 0
-                
-                # 等待下一次重试
-                time.sleep(self.config.wait_between_clicks)
-            
+        # 按距离层级、在每个距离的8个方向上进行重试
+        for distance, dx, dy in self.config.offset_table:
             if len(self.click_attempts) >= self.config.max_retries:
                 break
+
+            # 计算偏移坐标
+            offset_x = center_x + dx
+            offset_y = center_y + dy
+
+            # 落在窗口外的点不可能点中目标，直接跳过
+            if app_rect is not None:
+                left, top, width, height = app_rect
+                if not (left <= offset_x < left + width and top <= offset_y < top + height):
+                    continue
+
+            # 从第二次尝试起，每次点击前先确认元素仍然稳定
+            if retry_count > 0 and not self._should_continue_retry():
+                self._log_buffer.append("Element is no longer stable, stopping retry")
+                break
+
+            if distance != current_distance:
+                current_distance = distance
+                self._log_buffer.append(f"Trying offset distance: ±{distance}px")
+            
+            # 更新参数中的坐标
+            self._update_params_with_coordinates(
+                retry_params, offset_x, offset_y, relative_transform
+            )
+            
+            # 尝试点击
+            result = self._attempt_click(
+                original_click_func, retry_params, offset_x, offset_y
+            )
+            
+            if result["success"]:
+                self._log_buffer.append(f"Smart retry succeeded at offset ({dx}, {dy})")
+                return result["message"]
+            
+            # 指数退避加随机抖动后再进行下一次重试
+            time.sleep(self._retry_delay(retry_count))
+            retry_count += 1
         
         # 所有重试都失败
-        print_with_color(f"Smart click retry exhausted after {len(self.click_attempts)} attempts", "red")
+        self._log_buffer.append(f"Smart click retry exhausted after {len(self.click_attempts)} attempts")
         return f"Click failed after {len(self.click_attempts)} retry attempts"
     
+    def _flush_log(self) -> None:
+        """将本次重试缓存的日志作为一个块输出，成功时为绿色，否则为黄色"""
+        if not self._log_buffer:
+            return
+        succeeded = any(attempt.success for attempt in self.click_attempts)
+        print_with_color("\n".join(self._log_buffer), "green" if succeeded else "yellow")
+        self._log_buffer.clear()
+
+    def _retry_delay(self, retry_count: int) -> float:
+        """计算第retry_count次重试后的等待时间：指数退避，以wait_between_clicks为上限，再加随机抖动"""
+        config = self.config
+        backoff = config.retry_base * (2 ** min(retry_count, 5))
+        return min(backoff, config.retry_cap, config.wait_between_clicks) + random.uniform(
+            0, config.retry_jitter
+        )
+
+    @staticmethod
+    def _get_relative_transform(
+        app_rect: Optional[Tuple[int, int, int, int]]
+    ) -> Optional[Tuple[int, int, float, float]]:
+        """由窗口矩形计算 (left, top, 1/width, 1/height)，无法换算时返回None"""
+        try:
+            left, top, width, height = app_rect
+            return (left, top, 1.0 / width, 1.0 / height)
+        except Exception as e:
+            print_with_color(f"Failed to update coordinates in params: {e}", "yellow")
+            return None
+
     def _update_params_with_coordinates(
         self, 
-        original_params: Dict[str, Any], 
+        params: Dict[str, Any], 
         abs_x: int, 
         abs_y: int, 
-        application_window: UIAWrapper
+        relative_transform: Optional[Tuple[int, int, float, float]]
     ) -> Dict[str, Any]:
-        """更新参数中的坐标为新的偏移坐标"""
-        params = original_params.copy()
-        
-        try:
+        """将参数中的坐标原地更新为新的偏移坐标"""
+        if relative_transform is not None:
             # 转换绝对坐标为相对坐标
-            app_rect = application_window.rectangle()
-            rel_x = (abs_x - app_rect.left) / app_rect.width()
-            rel_y = (abs_y - app_rect.top) / app_rect.height()
-            
-            params["x"] = rel_x
-            params["y"] = rel_y
-            
-        except Exception as e:
-            print_with_color(f"Failed to update coordinates in params: {e}", "yellow")
+            left, top, inv_width, inv_height = relative_transform
+            params["x"] = (abs_x - left) * inv_width
+            params["y"] = (abs_y - top) * inv_height
         
         return params
     
@@ -300,16 +492,13 @@ class SmartClickController:
         self, click_func, params: Dict[str, Any], x: int, y: int
     ) -> Dict[str, Any]:
         """尝试执行单次点击"""
-        attempt = ClickAttempt(x=x, y=y, timestamp=time.time())
+        attempt = ClickAttempt(x=x, y=y, timestamp=time.perf_counter_ns())
         
         try:
             # 执行点击
             result = click_func(params)
             
-            # 等待并检查焦点变化
-            time.sleep(self.config.wait_between_clicks)
-            
-            # 检查是否有焦点变化（表示点击成功）
+            # 检查是否有焦点变化（表示点击成功），等待由焦点检测本身完成
             if self._check_click_success():
                 attempt.success = True
                 attempt.error_message = "Success"
@@ -322,7 +511,7 @@ class SmartClickController:
         except Exception as e:
             attempt.success = False
             attempt.error_message = str(e)
-            print_with_color(f"Click attempt failed: {e}", "yellow")
+            self._log_buffer.append(f"Click attempt failed: {e}")
         
         self.click_attempts.append(attempt)
         return {"success": False, "message": attempt.error_message}
@@ -330,13 +519,7 @@ class SmartClickController:
     def _check_click_success(self) -> bool:
         """检查点击是否成功（通过焦点变化判断）"""
         # 给系统一些时间响应
-        start_time = time.time()
-        while time.time() - start_time < self.config.focus_change_timeout:
-            if self.focus_detector.has_focus_changed(None):  # TODO: 传入正确的window
-                return True
-            time.sleep(0.05)  # 短暂等待后再次检查
-        
-        return False
+        return self.focus_detector.wait_for_focus_change(self.config.focus_change_timeout)
     
     def _should_continue_retry(self) -> bool:
         """判断是否应该继续重试"""
@@ -366,6 +549,21 @@ class SmartClickController:
         }
 
 
+# ElementNotEnabled异常的关键词
+NOT_ENABLED_KEYWORDS = frozenset({
+    "elementnotenabled",
+    "element not enabled",
+    "not enabled",
+    "element is not enabled",
+})
+
+# 所有关键词合成一个正则，一次扫描完成匹配
+_NOT_ENABLED_PATTERN = re.compile(
+    "|".join(re.escape(keyword) for keyword in sorted(NOT_ENABLED_KEYWORDS, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+
 def handle_element_not_enabled_exception(exception: Exception) -> bool:
     """
     检查异常是否为ElementNotEnabled类型
@@ -373,13 +571,28 @@ def handle_element_not_enabled_exception(exception: Exception) -> bool:
     :param exception: 捕获的异常
     :return: 如果是ElementNotEnabled异常则返回True
     """
-    error_message = str(exception).lower()
-    return any(keyword in error_message for keyword in [
-        "elementnotenabled", 
-        "element not enabled", 
-        "not enabled",
-        "element is not enabled"
-    ])
+    return _NOT_ENABLED_PATTERN.search(str(exception)) is not None
+
+
+def is_control_disabled(control: Optional[UIAWrapper], cached_element=None) -> bool:
+    """
+    检查控件当前是否被禁用。UIA元素直接读取CurrentIsEnabled，避免读到inspector缓存的旧状态
+    
+    :param control: 目标控件
+    :param cached_element: 本次点击开始时通过BuildUpdatedCache缓存了IsEnabled的UIA元素
+    :return: 确定被禁用时返回True，无控件或无法判断时返回False
+    """
+    if control is None:
+        return False
+    try:
+        if cached_element is not None:
+            return not cached_element.CachedIsEnabled
+        element = getattr(control.element_info, "_element", None)
+        if element is not None:
+            return not element.CurrentIsEnabled
+        return not control.is_enabled()
+    except Exception:
+        return False
 
 
 def should_trigger_smart_retry(exception: Exception, consecutive_failures: int) -> bool: